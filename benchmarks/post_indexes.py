@@ -0,0 +1,148 @@
+"""Сравнение планов запросов лент с индексами из миграции 0005 и без них.
+
+Скрипт создаёт временную базу SQLite, заполняет её публикациями
+и комментариями, выполняет запросы лент и выводит EXPLAIN QUERY PLAN
+и среднее время выполнения до и после удаления индексов.
+
+Запуск из корня репозитория:
+    python benchmarks/post_indexes.py --posts 500000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import django
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+BATCH_SIZE = 10000
+REPEATS = 20
+
+
+def seed(posts_total, comments_total):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from blog.models import Category, Comment, Location, Post
+
+    get_user_model().objects.bulk_create(
+        get_user_model()(username=f'user{index}') for index in range(100)
+    )
+    Category.objects.bulk_create(
+        Category(
+            title=f'Категория {index}',
+            description='Описание',
+            slug=f'category-{index}',
+            is_published=index % 10 != 0
+        ) for index in range(30)
+    )
+    Location.objects.bulk_create(
+        Location(name=f'Место {index}') for index in range(30)
+    )
+    # SQLite не возвращает первичные ключи из bulk_create.
+    users = list(get_user_model().objects.all())
+    categories = list(Category.objects.all())
+    locations = list(Location.objects.all())
+    now = timezone.now()
+    for start in range(0, posts_total, BATCH_SIZE):
+        Post.objects.bulk_create(
+            Post(
+                title=f'Публикация {index}',
+                text='Текст публикации',
+                pub_date=now - timedelta(
+                    minutes=random.randint(-60 * 24 * 30, 60 * 24 * 365 * 5)
+                ),
+                is_published=random.random() > 0.05,
+                author=random.choice(users),
+                category=random.choice(categories),
+                location=random.choice(locations),
+            ) for index in range(start, min(start + BATCH_SIZE, posts_total))
+        )
+    post_ids = list(Post.objects.values_list('id', flat=True))
+    for start in range(0, comments_total, BATCH_SIZE):
+        Comment.objects.bulk_create(
+            Comment(
+                post_id=random.choice(post_ids),
+                author=random.choice(users),
+                text='Комментарий'
+            ) for _ in range(start, min(start + BATCH_SIZE, comments_total))
+        )
+    Post.objects.recount_comments()
+
+
+def get_queries():
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Category, Post
+
+    category = Category.objects.filter(is_published=True).first()
+    author = get_user_model().objects.first()
+    post = Post.objects.order_by('-comment_count').first()
+    return {
+        'Лента': Post.objects.get_posts()[:10],
+        'Категория': category.posts.get_posts()[:10],
+        'Профиль': author.posts.get_posts(apply_filters=False)[:10],
+        'Комментарии': post.comments.select_related('author')[:10],
+    }
+
+
+def report(title):
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    print(f'\n=== {title} ===')
+    for name, queryset in get_queries().items():
+        started = time.perf_counter()
+        for _ in range(REPEATS):
+            list(queryset.all())
+        elapsed = (time.perf_counter() - started) / REPEATS * 1000
+        print(f'\n{name}: {elapsed:.2f} мс')
+        print(queryset.explain())
+
+
+def drop_indexes():
+    from django.db import connection
+
+    from blog.models import Comment, Post
+
+    with connection.schema_editor() as schema_editor:
+        for model in (Post, Comment):
+            for index in model._meta.indexes:
+                schema_editor.remove_index(model, index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=500000)
+    parser.add_argument('--comments', type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        from django.conf import settings
+        settings.DATABASES['default']['NAME'] = (
+            Path(tmp_dir) / 'benchmark.sqlite3'
+        )
+        django.setup()
+
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+        started = time.perf_counter()
+        seed(args.posts, args.comments)
+        print(
+            f'Создано публикаций: {args.posts}, комментариев: '
+            f'{args.comments} за {time.perf_counter() - started:.1f} с'
+        )
+        report('С индексами')
+        drop_indexes()
+        report('Без индексов')
+
+
+if __name__ == '__main__':
+    main()
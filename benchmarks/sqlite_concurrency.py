@@ -0,0 +1,166 @@
+"""Конкурентная нагрузка на SQLite: комментарии пишутся, пока читается лента.
+
+Скрипт создаёт временную базу, заполняет её публикациями и запускает
+потоки-писатели, добавляющие комментарии, и потоки-читатели,
+запрашивающие главную страницу. Замер выполняется дважды: с настройками
+SQLite по умолчанию и с SQLITE_PRAGMAS из settings. Для каждого прогона
+выводятся число операций, ошибки database is locked и задержки.
+
+Запуск из корня репозитория:
+    python benchmarks/sqlite_concurrency.py --writers 8 --readers 8
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import django
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+POSTS_TOTAL = 200
+
+
+def seed():
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from blog.models import Category, Post
+
+    get_user_model().objects.bulk_create(
+        get_user_model()(username=f'user{index}') for index in range(20)
+    )
+    category = Category.objects.create(
+        title='Категория', description='Описание', slug='category'
+    )
+    author = get_user_model().objects.first()
+    Post.objects.bulk_create(
+        Post(
+            title=f'Публикация {index}',
+            text='Текст публикации',
+            pub_date=timezone.now(),
+            author=author,
+            category=category,
+        ) for index in range(POSTS_TOTAL)
+    )
+
+
+class Worker(threading.Thread):
+    def __init__(self, action, deadline):
+        super().__init__()
+        self.action = action
+        self.deadline = deadline
+        self.timings = []
+        self.errors = 0
+
+    def run(self):
+        from django.db import OperationalError, connection
+
+        try:
+            while time.monotonic() < self.deadline:
+                started = time.perf_counter()
+                try:
+                    self.action()
+                except OperationalError:
+                    self.errors += 1
+                else:
+                    self.timings.append(time.perf_counter() - started)
+        finally:
+            connection.close()
+
+
+def write_comment():
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Comment, Post
+
+    Comment.objects.create(
+        post=Post.objects.order_by('?').first(),
+        author=get_user_model().objects.order_by('?').first(),
+        text='Комментарий'
+    )
+
+
+def read_post_list(client):
+    response = client.get('/')
+    assert response.status_code == 200, response.status_code
+
+
+def report(title, workers):
+    timings = sorted(
+        timing for worker in workers for timing in worker.timings
+    )
+    errors = sum(worker.errors for worker in workers)
+    if not timings:
+        print(f'{title}: 0 операций, ошибок блокировки {errors}')
+        return
+    p95 = timings[int(len(timings) * 0.95)]
+    print(
+        f'{title}: {len(timings)} операций, ошибок блокировки {errors}, '
+        f'медиана {statistics.median(timings) * 1000:.1f} мс, '
+        f'p95 {p95 * 1000:.1f} мс, макс. {timings[-1] * 1000:.1f} мс'
+    )
+
+
+def run(title, tmp_dir, pragmas, args):
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connections
+    from django.test import Client
+
+    connections.close_all()
+    settings.DATABASES['default']['NAME'] = Path(tmp_dir) / f'{title}.sqlite3'
+    settings.SQLITE_PRAGMAS = pragmas
+    call_command('migrate', verbosity=0)
+    seed()
+    connections.close_all()
+
+    deadline = time.monotonic() + args.seconds
+    writers = [
+        Worker(write_comment, deadline) for _ in range(args.writers)
+    ]
+    readers = [
+        Worker(lambda client=Client(): read_post_list(client), deadline)
+        for _ in range(args.readers)
+    ]
+    for worker in writers + readers:
+        worker.start()
+    for worker in writers + readers:
+        worker.join()
+
+    print(f'\n=== {title}: {pragmas or "настройки по умолчанию"} ===')
+    report('Запись комментариев', writers)
+    report('Чтение ленты', readers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    from django.conf import settings
+    # Кеш страниц скрыл бы чтения из базы, а замерить нужно именно их.
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        }
+    }
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.DEBUG = False
+    django.setup()
+
+    tuned = dict(settings.SQLITE_PRAGMAS)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        run('default', tmp_dir, {}, args)
+        run('tuned', tmp_dir, tuned, args)
+
+
+if __name__ == '__main__':
+    main()
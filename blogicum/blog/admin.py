@@ -1,37 +1,106 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME, ActionForm
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin
+from django.db import connections
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
 
-from .models import Post, Category, Location, Comment, User
+from .constants import ADMIN_RECENT_POSTS_LIMIT
+from .models import Post, Category, Location, Comment, Task, User
+from .moderation import delete_posts, update_posts
+from .search import COMMENT_SEARCH_TABLE, SEARCH_TABLE, filter_by_search_index
 
 
 admin.site.empty_value_display = 'Не задано'
 
 
-class PostInline(admin.StackedInline):
-    model = Post
-    extra = 0
+class FullTextSearchMixin:
+    """Поиск в списке объектов по индексу FTS5 вместо LIKE '%...%'.
+
+    На других СУБД используется обычный поиск по search_fields.
+    """
+
+    search_index = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if connections[queryset.db].vendor != 'sqlite':
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        return filter_by_search_index(
+            queryset, self.search_index, search_term
+        ), False
+
+
+class PostLinksMixin:
+    """Последние публикации и ссылка на их полный список вместо inline.
+
+    Вложенная форма загружала и выводила все публикации категории
+    или места; здесь их не больше ADMIN_RECENT_POSTS_LIMIT, а весь
+    список открывается в постраничном списке публикаций с фильтром.
+    """
+
+    readonly_fields = ('post_links',)
+    post_filter = None
+
+    @admin.display(description='Публикации')
+    def post_links(self, obj):
+        if obj.pk is None:
+            return self.get_empty_value_display()
+        posts = obj.posts.order_by('-pub_date').values_list('pk', 'title')
+        return format_html(
+            '<a href="{}?{}={}">Все публикации: {}</a><ul>{}</ul>',
+            reverse('admin:blog_post_changelist'), self.post_filter, obj.pk,
+            posts.count(),
+            format_html_join('', '<li><a href="{}">{}</a></li>', (
+                (reverse('admin:blog_post_change', args=[pk]), title)
+                for pk, title in posts[:ADMIN_RECENT_POSTS_LIMIT]
+            ))
+        )
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
-    inlines = (PostInline,)
+class CategoryAdmin(PostLinksMixin, admin.ModelAdmin):
     list_display = ('title',)
+    search_fields = ('title',)
+    post_filter = 'category__id__exact'
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
-    inlines = (PostInline,)
+class LocationAdmin(PostLinksMixin, admin.ModelAdmin):
     list_display = ('name',)
+    search_fields = ('name',)
+    post_filter = 'location__id__exact'
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
-    list_display = ('text', 'post')
+class CommentAdmin(FullTextSearchMixin, admin.ModelAdmin):
+    list_display = ('text', 'post', 'author', 'created_at')
+    list_select_related = ('post', 'author')
+    autocomplete_fields = ('post', 'author')
+    search_fields = ('text',)
+    search_index = COMMENT_SEARCH_TABLE
+    show_full_result_count = False
+
+
+class PostActionForm(ActionForm):
+    category = forms.ModelChoiceField(
+        Category.objects.all(),
+        required=False,
+        label='Категория',
+        help_text='Для действия «Перенести в категорию».'
+    )
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(FullTextSearchMixin, admin.ModelAdmin):
+    action_form = PostActionForm
+    actions = (
+        'publish', 'unpublish', 'move_to_category', 'delete_with_comments'
+    )
     list_display = (
         'title',
         'text',
@@ -45,10 +114,114 @@ class PostAdmin(admin.ModelAdmin):
         'is_published',
         'category'
     )
-    search_fields = ('title',)
+    list_select_related = ('author', 'location', 'category')
+    autocomplete_fields = ('author', 'location', 'category')
+    search_fields = ('title', 'text')
+    search_index = SEARCH_TABLE
+    show_full_result_count = False
     list_filter = ('category',)
     list_display_links = ('title',)
 
+    def get_actions(self, request):
+        # Стандартное удаление загружает каждую публикацию и комментарий.
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    @admin.action(
+        description='Опубликовать выбранные публикации',
+        permissions=('change',)
+    )
+    def publish(self, request, queryset):
+        updated = update_posts(queryset, is_published=True)
+        self.message_user(request, f'Опубликовано публикаций: {updated}')
+
+    @admin.action(
+        description='Снять с публикации выбранные публикации',
+        permissions=('change',)
+    )
+    def unpublish(self, request, queryset):
+        updated = update_posts(queryset, is_published=False)
+        self.message_user(request, f'Скрыто публикаций: {updated}')
+
+    @admin.action(
+        description='Перенести в категорию',
+        permissions=('change',)
+    )
+    def move_to_category(self, request, queryset):
+        form = self.action_form(request.POST)
+        form.fields['action'].choices = self.get_action_choices(request)
+        if not form.is_valid() or form.cleaned_data['category'] is None:
+            self.message_user(
+                request, 'Выберите категорию для переноса.', messages.ERROR
+            )
+            return
+        category = form.cleaned_data['category']
+        updated = update_posts(queryset, category=category)
+        self.message_user(
+            request, f'Перенесено в «{category}» публикаций: {updated}'
+        )
+
+    @admin.action(
+        description='Удалить выбранные публикации с комментариями',
+        permissions=('delete',)
+    )
+    def delete_with_comments(self, request, queryset):
+        if request.POST.get('post') == 'yes':
+            deleted = delete_posts(queryset)
+            self.message_user(request, f'Удалено публикаций: {deleted}')
+            return None
+        return TemplateResponse(
+            request,
+            'admin/blog/post/delete_with_comments.html',
+            {
+                **self.admin_site.each_context(request),
+                'title': 'Удаление публикаций',
+                'opts': self.model._meta,
+                'action': 'delete_with_comments',
+                'action_checkbox_name': ACTION_CHECKBOX_NAME,
+                'selected': request.POST.getlist(ACTION_CHECKBOX_NAME),
+                'select_across': request.POST.get('select_across', '0'),
+                'posts_count': queryset.count(),
+                'comments_count': Comment.objects.filter(
+                    post__in=queryset.order_by().values('pk')
+                ).count(),
+            }
+        )
+
+    def get_autocomplete_fields(self, request):
+        # В списке с list_editable поля остаются обычным списком выбора:
+        # виджет автодополнения делал бы запрос для каждой строки.
+        opts = self.model._meta
+        if request.resolver_match.url_name == (
+                f'{opts.app_label}_{opts.model_name}_changelist'):
+            return tuple(
+                name for name in self.autocomplete_fields
+                if name not in self.list_editable
+            )
+        return self.autocomplete_fields
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_foreignkey(
+            db_field, request, **kwargs
+        )
+        if (
+            db_field.name in self.list_editable
+            and db_field.name not in self.get_autocomplete_fields(request)
+        ):
+            # Варианты выбора читаются из базы один раз, а не для каждой
+            # строки списка с list_editable.
+            formfield.choices = list(formfield.choices)
+            formfield.widget.choices = formfield.choices
+        return formfield
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_at')
+    list_filter = ('status',)
+    readonly_fields = ('last_error',)
+
 
 # Получаем модель User
 User = get_user_model()
@@ -0,0 +1,114 @@
+import hashlib
+import math
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .constants import POSTS_CACHE_TIMEOUT
+from .models import Post
+
+POSTS_VERSION_KEY = 'blog:posts:version'
+
+
+def get_posts_version(namespace=None):
+    """Версия кэша всех лент или одной из них.
+
+    Пространства лент: index, category:<slug>, profile:<username>
+    и post:<id> для страницы публикации.
+    """
+    key = POSTS_VERSION_KEY if namespace is None else (
+        f'{POSTS_VERSION_KEY}:{namespace}'
+    )
+    version = cache.get(key)
+    if version is None:
+        # Начальное значение из времени не совпадёт с версиями ключей,
+        # оставшихся в кэше после вытеснения счётчика.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_feed_version(namespace):
+    # Общая версия сбрасывает все ленты сразу: категории, места, пакетные
+    # изменения публикаций.
+    return f'{get_posts_version()}.{get_posts_version(namespace)}'
+
+
+def invalidate_posts(*namespaces):
+    """Сбрасывает кэш перечисленных лент или, без аргументов, всех."""
+    keys = [f'{POSTS_VERSION_KEY}:{namespace}' for namespace in namespaces]
+    for key in keys or [POSTS_VERSION_KEY]:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def get_post_namespaces(*post_ids, using=None):
+    """Ленты, в которых выводятся публикации с указанными id."""
+    posts = Post.objects.filter(pk__in=post_ids)
+    if using is not None:
+        posts = posts.using(using)
+    namespaces = set()
+    for post_id, category_slug, username in posts.values_list(
+            'pk', 'category__slug', 'author__username'):
+        namespaces.update(('index', f'post:{post_id}', f'profile:{username}'))
+        if category_slug is not None:
+            namespaces.add(f'category:{category_slug}')
+    return namespaces
+
+
+def make_posts_key(namespace, *parts):
+    position = hashlib.md5(str(parts[-1]).encode()).hexdigest()
+    return ':'.join((
+        'blog:posts', get_feed_version(namespace), namespace,
+        *map(str, parts[:-1]), position
+    ))
+
+
+def get_next_pub_date():
+    """Дата ближайшей отложенной публикации или False, если таких нет.
+
+    Значение хранится в кэше до смены версии главной ленты, в которой
+    отражается любое изменение публикаций, или до наступления даты.
+    """
+    now = timezone.now()
+    key = f'blog:posts:{get_feed_version("index")}:next_pub_date'
+    next_pub_date = cache.get(key)
+    if next_pub_date is None or next_pub_date and next_pub_date <= now:
+        next_pub_date = Post.objects.filter(
+            is_published=True, pub_date__gt=now
+        ).order_by('pub_date').values_list('pub_date', flat=True).first()
+        # False отличает «отложенных публикаций нет» от промаха кэша.
+        next_pub_date = next_pub_date or False
+        cache.set(key, next_pub_date, POSTS_CACHE_TIMEOUT)
+    return next_pub_date
+
+
+def get_posts_timeout():
+    """Время жизни страниц лент, не превышающее срок ближайшей
+    отложенной публикации: после него страница должна её показать.
+    """
+    next_pub_date = get_next_pub_date()
+    if not next_pub_date:
+        return POSTS_CACHE_TIMEOUT
+    return max(1, min(
+        POSTS_CACHE_TIMEOUT,
+        math.ceil((next_pub_date - timezone.now()).total_seconds())
+    ))
+
+
+def make_posts_etag(namespace, *parts):
+    """ETag, который меняется вместе с публикациями ленты namespace."""
+    return hashlib.md5(':'.join(map(str, (
+        get_feed_version(namespace), get_next_pub_date(), *parts
+    ))).encode()).hexdigest()
+
+
+def get_or_set_posts(key, build):
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, timeout=get_posts_timeout())
+    return data
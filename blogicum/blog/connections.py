@@ -0,0 +1,30 @@
+from django.db import connections
+
+
+def close_unusable_connections():
+    """Закрывает постоянные соединения, которые больше не отвечают.
+
+    Django 3.2 проверяет соединение, только если в нём уже была ошибка,
+    поэтому разорванное сервером соединение ломало бы первый запрос после
+    простоя. Проверка включается ключом CONN_HEALTH_CHECKS в DATABASES,
+    как в Django 4.1, и выполняется перед каждым запросом.
+    """
+    for connection in connections.all():
+        if (
+            connection.connection is not None
+            and connection.settings_dict.get('CONN_HEALTH_CHECKS')
+            and not connection.in_atomic_block
+            and not connection.is_usable()
+        ):
+            connection.close()
+
+
+def refresh_connections():
+    """То же, что Django делает между запросами, для фоновых процессов.
+
+    Соединения с открытой транзакцией не трогаются.
+    """
+    for connection in connections.all():
+        if not connection.in_atomic_block:
+            connection.close_if_unusable_or_obsolete()
+    close_unusable_connections()
@@ -1,3 +1,27 @@
 MAX_TEXT_LENGTH = 256
 TITLE_LENGTH_LIMIT = 20
 POSTS_PER_PAGE_LIMIT = 10
+COMMENT_COUNT_BATCH_SIZE = 1000
+COMMENTS_PER_PAGE_LIMIT = 20
+POSTS_CACHE_TIMEOUT = 60 * 5
+POST_IMAGE_WIDTHS = (320, 640, 1280)
+POST_CARD_IMAGE_WIDTH = 640
+POST_IMAGE_JPEG_QUALITY = 82
+POST_IMAGE_WEBP_QUALITY = 80
+TASK_MAX_ATTEMPTS = 5
+TASK_RETRY_DELAY = 30
+TASK_LOCK_TIMEOUT = 60 * 10
+TASK_POLL_INTERVAL = 2
+TASK_CLAIM_CANDIDATES = 10
+POST_IMAGE_MAX_SIZE = 10 * 1024 * 1024
+POST_IMAGE_MAX_SIDE = 8000
+POST_IMAGE_MAX_PIXELS = 40_000_000
+POST_IMAGE_FORMATS = ('JPEG', 'PNG', 'GIF', 'WEBP')
+POST_IMAGE_HEADER_LIMIT = 256 * 1024
+POST_IMAGE_DAILY_QUOTA = 100 * 1024 * 1024
+SEARCH_MAX_WORDS = 8
+SEARCH_TITLE_WEIGHT = 10.0
+SEARCH_TEXT_WEIGHT = 1.0
+ADMIN_RECENT_POSTS_LIMIT = 10
+MODERATION_BATCH_SIZE = 1000
+FEED_ITEMS_LIMIT = 20
@@ -0,0 +1,132 @@
+from django.contrib.auth.models import User
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import quote_etag
+
+from .cache import get_or_set_posts, make_posts_etag, make_posts_key
+from .constants import FEED_ITEMS_LIMIT
+from .models import Category, Post
+
+
+class CachedFeed(Feed):
+    """Лента публикаций для агрегаторов с кэшем и условным GET.
+
+    Готовый ответ хранится в версионном кэше лент, а ETag строится
+    из той же версии: пока публикации не менялись, повторный опрос
+    получает 304 без запросов к базе и без сборки XML.
+    """
+
+    cache_namespace = 'index'
+
+    def __call__(self, request, *args, **kwargs):
+        namespace = self.cache_namespace.format(**kwargs)
+        # Ссылки в ленте абсолютные: схема и хост входят в ключ и ETag.
+        parts = ('feed', request.scheme, request.get_host(), request.path)
+        etag = quote_etag(make_posts_etag(namespace, *parts))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = get_or_set_posts(
+                make_posts_key(namespace, *parts),
+                lambda: super(CachedFeed, self).__call__(
+                    request, *args, **kwargs
+                )
+            )
+        response['ETag'] = etag
+        return response
+
+    def get_posts(self, obj):
+        return Post.objects.get_posts()
+
+    def items(self, obj):
+        return self.get_posts(obj)[:FEED_ITEMS_LIMIT]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.text
+
+    def item_link(self, post):
+        return reverse('blog:post_detail', args=[post.pk])
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        return post.updated_at
+
+    def item_author_name(self, post):
+        return post.author.get_username()
+
+    def item_categories(self, post):
+        return (post.category.title,)
+
+
+class PostsFeed(CachedFeed):
+    title = 'Блогикум'
+    description = 'Новые публикации Блогикума.'
+
+    def link(self):
+        return reverse('blog:post_list')
+
+
+class CategoryPostsFeed(CachedFeed):
+    cache_namespace = 'category:{category_slug}'
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def get_posts(self, category):
+        return category.posts.get_posts()
+
+    def title(self, category):
+        return f'Блогикум: {category.title}'
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse('blog:category_posts', args=[category.slug])
+
+
+class AuthorPostsFeed(CachedFeed):
+    cache_namespace = 'profile:{username}'
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def get_posts(self, author):
+        return author.posts.get_posts()
+
+    def title(self, author):
+        return f'Блогикум: публикации {author.get_username()}'
+
+    def description(self, author):
+        return f'Новые публикации пользователя {author.get_username()}.'
+
+    def link(self, author):
+        return reverse('blog:profile', args=[author.get_username()])
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self._get_dynamic_attr('description', obj)
+
+
+class PostsAtomFeed(AtomFeedMixin, PostsFeed):
+    pass
+
+
+class CategoryPostsAtomFeed(AtomFeedMixin, CategoryPostsFeed):
+    pass
+
+
+class AuthorPostsAtomFeed(AtomFeedMixin, AuthorPostsFeed):
+    pass
@@ -0,0 +1,90 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .cache import get_post_namespaces, invalidate_posts
+from .constants import (POST_IMAGE_JPEG_QUALITY, POST_IMAGE_WEBP_QUALITY,
+                        POST_IMAGE_WIDTHS)
+from .models import Post
+from .tasks import task
+
+RENDITION_FORMATS = {
+    'webp': ('WEBP', 'webp', {
+        'quality': POST_IMAGE_WEBP_QUALITY,
+        'method': 4,
+    }),
+    'jpeg': ('JPEG', 'jpg', {
+        'quality': POST_IMAGE_JPEG_QUALITY,
+        'optimize': True,
+        'progressive': True,
+    }),
+}
+
+
+def get_rendition_widths(original_width):
+    """Ширины уменьшенных копий: без увеличения исходного изображения."""
+    widths = [width for width in POST_IMAGE_WIDTHS if width < original_width]
+    if len(widths) < len(POST_IMAGE_WIDTHS):
+        widths.append(original_width)
+    return widths
+
+
+def generate_renditions(image_file):
+    """Создаёт WebP и JPEG копии изображения нескольких ширин рядом
+    с оригиналом и возвращает их описание для Post.image_renditions.
+    """
+    storage = image_file.storage
+    source = PurePosixPath(image_file.name)
+    with image_file.open('rb'), Image.open(image_file) as original:
+        image = ImageOps.exif_transpose(original).convert('RGB')
+    renditions = {'source': image_file.name}
+    for kind, (image_format, extension, options) in (
+            RENDITION_FORMATS.items()):
+        renditions[kind] = []
+        for width in get_rendition_widths(image.width):
+            copy = image.copy()
+            copy.thumbnail((width, image.height * width // image.width + 1))
+            buffer = BytesIO()
+            copy.save(buffer, image_format, **options)
+            name = storage.save(
+                str(source.parent / 'renditions'
+                    / f'{source.stem}_{width}.{extension}'),
+                ContentFile(buffer.getvalue())
+            )
+            renditions[kind].append([width, name])
+    return renditions
+
+
+def build_renditions(image_file):
+    try:
+        return generate_renditions(image_file)
+    except (OSError, Image.DecompressionBombError):
+        # Повреждённое фото показываем как есть и не обрабатываем снова.
+        return {'source': image_file.name}
+
+
+@task
+def refresh_post_renditions(post_id):
+    post = Post.objects.filter(pk=post_id).first()
+    if post is None:
+        return
+    if post.image_renditions.get('source') == (post.image.name or None):
+        return
+    # Старые копии могут принадлежать и другим публикациям с тем же фото,
+    # их удаляет команда collect_media.
+    renditions = {}
+    if post.image:
+        # Такое же фото, загруженное раньше, уже обработано.
+        renditions = Post.objects.filter(
+            image_renditions__source=post.image.name
+        ).exclude(pk=post_id).values_list(
+            'image_renditions', flat=True
+        ).first() or build_renditions(post.image)
+    Post.objects.filter(pk=post_id).update(
+        image_renditions=renditions,
+        updated_at=timezone.now()
+    )
+    invalidate_posts(*get_post_namespaces(post_id))
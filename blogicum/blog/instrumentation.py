@@ -0,0 +1,122 @@
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+logger = logging.getLogger('blog.instrumentation')
+
+_worker_lock = threading.Lock()
+_worker_connection_opens = 0
+_request_stats = ContextVar('request_stats', default=None)
+
+
+class NPlusOneError(Exception):
+    """Запрос одной формы выполнен для каждой строки выборки."""
+
+
+class RequestStats:
+    """Счётчики одного запроса или одной итерации фонового обработчика."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.connection_opens = 0
+        self.queries = []
+        self.db_time = 0
+        self.render_time = 0
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def __call__(self, execute, sql, params, many, context):
+        # Обёртка connection.execute_wrapper: время каждого запроса к базе.
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.db_time += duration
+            self.queries.append(
+                (context['connection'].alias, sql, params, duration)
+            )
+
+
+@contextmanager
+def collect_request_stats():
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+def get_request_stats():
+    return _request_stats.get()
+
+
+def record_connection_open():
+    global _worker_connection_opens
+    with _worker_lock:
+        _worker_connection_opens += 1
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.connection_opens += 1
+
+
+def get_worker_connection_opens():
+    """Сколько соединений с базой открыл текущий процесс с момента запуска."""
+    return _worker_connection_opens
+
+
+def format_connection_stats(stats):
+    return (
+        f'request={stats.connection_opens}, '
+        f'worker={get_worker_connection_opens()}, pid={os.getpid()}'
+    )
+
+
+def format_server_timing(stats):
+    return ', '.join((
+        f'db;dur={stats.db_time * 1000:.1f};'
+        f'desc="{len(stats.queries)} queries"',
+        f'tpl;dur={stats.render_time * 1000:.1f}',
+        f'total;dur={stats.total_time * 1000:.1f}',
+    ))
+
+
+def format_queries(stats, with_params=False):
+    # В параметрах бывают сессии, хеши паролей и адреса почты.
+    return '\n'.join(
+        f'[{alias}] {duration * 1000:.1f} ms: {sql}'
+        + (f' {params!r}' if with_params else '')
+        for alias, sql, params, duration in stats.queries
+    )
+
+
+def find_repeated_queries(stats, threshold):
+    """Формы SQL, выполненные в запросе не меньше threshold раз.
+
+    Параметры в SQL Django не подставлены, поэтому одинаковая строка
+    означает один и тот же запрос для разных объектов: обычно это
+    забытый select_related или prefetch_related.
+    """
+    counts = Counter((alias, sql) for alias, sql, _, _ in stats.queries)
+    return [
+        (alias, sql, count) for (alias, sql), count in counts.items()
+        if count >= threshold
+    ]
+
+
+def format_repeated_queries(repeated):
+    return '\n'.join(
+        f'[{alias}] {count} раз: {sql}' for alias, sql, count in repeated
+    )
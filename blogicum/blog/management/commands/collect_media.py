@@ -0,0 +1,69 @@
+import posixpath
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from blog.images import RENDITION_FORMATS
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет файлы фото публикаций, на которые не ссылается'
+        ' ни одна публикация.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=60 * 60,
+            help='Не удалять файлы моложе указанного числа секунд:'
+                 ' их публикации могут быть ещё не сохранены.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать файлы, которые будут удалены.'
+        )
+
+    def handle(self, *args, min_age, dry_run, **options):
+        upload_to = Post._meta.get_field('image').upload_to
+        referenced = set()
+        # Реплика может ещё не знать о только что загруженных фото.
+        posts = Post.objects.using(DEFAULT_DB_ALIAS).exclude(image='')
+        for image, renditions in posts.values_list(
+            'image', 'image_renditions'
+        ).iterator():
+            referenced.add(image)
+            for kind in RENDITION_FORMATS:
+                referenced.update(
+                    name for _, name in renditions.get(kind, ())
+                )
+        deadline = timezone.now() - timedelta(seconds=min_age)
+        removed = 0
+        for name in self.walk(upload_to):
+            if (
+                name in referenced
+                or default_storage.get_modified_time(name) > deadline
+            ):
+                continue
+            self.stdout.write(name)
+            if not dry_run:
+                default_storage.delete(name)
+            removed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Файлов без публикаций: {removed}'
+        ))
+
+    def walk(self, directory):
+        if not default_storage.exists(directory):
+            return
+        directories, files = default_storage.listdir(directory)
+        for name in files:
+            yield posixpath.join(directory, name)
+        for subdirectory in directories:
+            yield from self.walk(posixpath.join(directory, subdirectory))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog.search import install_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересоздаёт полнотекстовые индексы публикаций и комментариев '
+        'и их триггеры '
+        'по текущему содержимому базы.'
+    )
+
+    def handle(self, *args, **options):
+        connection = connections[DEFAULT_DB_ALIAS]
+        if connection.vendor != 'sqlite':
+            self.stdout.write(
+                'Индексы FTS5 нужны только для SQLite: '
+                'поиск выполняется без него.'
+            )
+            return
+        install_search_index(connection)
+        self.stdout.write(self.style.SUCCESS('Поисковые индексы перестроены.'))
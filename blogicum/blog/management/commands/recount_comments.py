@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+
+from blog.cache import invalidate_posts
+from blog.constants import COMMENT_COUNT_BATCH_SIZE
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает поле comment_count у публикаций пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=COMMENT_COUNT_BATCH_SIZE,
+            help='Количество публикаций, обрабатываемых за один запрос.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        bounds = Post.objects.aggregate(first=Min('id'), last=Max('id'))
+        if bounds['first'] is None:
+            return
+        updated = 0
+        for start in range(bounds['first'], bounds['last'] + 1, batch_size):
+            with transaction.atomic():
+                updated += Post.objects.filter(
+                    id__gte=start, id__lt=start + batch_size
+                ).recount_comments()
+        invalidate_posts()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано публикаций: {updated}')
+        )
@@ -0,0 +1,56 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в файлы реплик: локальная замена '
+        'репликации для проверки маршрутизации чтений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Скопировать базу один раз и завершиться.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1,
+            help='Пауза между копированиями, в секундах: отставание реплик.'
+        )
+
+    def handle(self, *args, once, interval, **options):
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError('Основная база должна быть SQLite.')
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError(
+                'Реплики не настроены: задайте DJANGO_DB_REPLICAS.'
+            )
+        try:
+            while True:
+                primary.ensure_connection()
+                for alias in settings.DATABASE_REPLICAS:
+                    name = settings.DATABASES[alias]['NAME']
+                    replica = sqlite3.connect(name)
+                    try:
+                        # Backup API копирует согласованный снимок,
+                        # не блокируя запись в основную базу надолго.
+                        primary.connection.backup(replica)
+                    finally:
+                        replica.close()
+                if once:
+                    self.stdout.write(self.style.SUCCESS(
+                        'Реплик обновлено: '
+                        f'{len(settings.DATABASE_REPLICAS)}'
+                    ))
+                    return
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            self.stdout.write('Репликация остановлена.')
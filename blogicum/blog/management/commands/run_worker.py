@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.constants import TASK_POLL_INTERVAL
+from blog.connections import refresh_connections
+from blog.instrumentation import get_worker_connection_opens
+from blog.routers import use_primary
+from blog.tasks import requeue_stale, run_pending
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в базе данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить накопившиеся задачи и завершиться.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=TASK_POLL_INTERVAL,
+            help='Пауза между опросами очереди, в секундах.'
+        )
+
+    def handle(self, *args, once, interval, **options):
+        # Очередь читается из основной базы: реплика может не видеть
+        # только что поставленных задач.
+        with use_primary():
+            self.run(once, interval)
+
+    def run(self, once, interval):
+        try:
+            while True:
+                # Между итерациями соединения живут по тем же правилам
+                # CONN_MAX_AGE, что и между HTTP-запросами.
+                refresh_connections()
+                requeue_stale()
+                succeeded, failed = run_pending()
+                if succeeded or failed:
+                    self.stdout.write(
+                        f'Выполнено задач: {succeeded}, с ошибкой: {failed}'
+                    )
+                if once:
+                    return
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            self.stdout.write(
+                'Обработчик остановлен. Открыто соединений с базой: '
+                f'{get_worker_connection_opens()}'
+            )
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.templates_warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Компилирует все шаблоны проекта и сообщает об ошибках в них.'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        names = warm_templates()
+        for name in names:
+            self.stdout.write(name, self.style.SQL_FIELD)
+        self.stdout.write(self.style.SUCCESS(
+            f'Скомпилировано шаблонов: {len(names)} '
+            f'за {time.perf_counter() - started:.2f} с'
+        ))
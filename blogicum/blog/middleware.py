@@ -0,0 +1,179 @@
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+from .cache import get_posts_timeout, make_posts_key
+from .instrumentation import (NPlusOneError, collect_request_stats,
+                              find_repeated_queries, format_connection_stats,
+                              format_queries, format_repeated_queries,
+                              format_server_timing, get_request_stats, logger)
+from .routers import use_primary, use_replica
+
+USE_PRIMARY_COOKIE = 'use_primary'
+
+
+class AnonymousPageCacheMiddleware:
+    """Кэширует страницы лент и публикаций для анонимных посетителей.
+
+    Ключи страниц лежат в версионном пространстве своей ленты или
+    публикации, поэтому сигналы моделей сбрасывают и их.
+    Авторизованные пользователи видят кнопки редактирования и форму
+    комментария, поэтому их запросы кэш не используют.
+    """
+
+    cached_views = {
+        'blog:post_list': 'index',
+        'blog:category_posts': 'category:{category_slug}',
+        'blog:profile': 'profile:{username}',
+        'blog:post_detail': 'post:{post_id}',
+    }
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        key = getattr(request, '_page_cache_key', None)
+        if key is not None:
+            patch_vary_headers(response, ('Cookie',))
+            if self.is_cacheable(request, response):
+                if hasattr(response, 'render') and callable(response.render):
+                    response.add_post_render_callback(
+                        lambda rendered: cache.set(
+                            key, rendered, get_posts_timeout()
+                        )
+                    )
+                else:
+                    cache.set(key, response, get_posts_timeout())
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or request.user.is_authenticated
+            or request.resolver_match.view_name not in self.cached_views
+        ):
+            return None
+        namespace = self.cached_views[
+            request.resolver_match.view_name
+        ].format(**view_kwargs)
+        key = make_posts_key(
+            namespace, 'page', request.get_host(), request.get_full_path()
+        )
+        response = cache.get(key)
+        if response is None:
+            # Страница из кэша уже сохранена: повторно не записываем.
+            request._page_cache_key = key
+        return response
+
+    @staticmethod
+    def is_cacheable(request, response):
+        # Страница с CSRF-токеном или новыми cookie привязана к посетителю.
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not request.META.get('CSRF_COOKIE_USED')
+        )
+
+
+class ReplicaStickinessMiddleware:
+    """Отправляет чтения в основную базу, пока реплики могут отставать.
+
+    Запросы, изменяющие данные, целиком выполняются на основной базе
+    и ставят короткоживущую cookie: пока она есть, посетитель читает
+    оттуда же и сразу видит свою публикацию или комментарий. Остальные
+    запросы читают из одной реплики, выбранной на весь запрос.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        writes = request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+        if not (writes or USE_PRIMARY_COOKIE in request.COOKIES):
+            with use_replica():
+                return self.get_response(request)
+        with use_primary():
+            response = self.get_response(request)
+        if writes and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                USE_PRIMARY_COOKIE, '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True, samesite='Lax'
+            )
+        return response
+
+
+class RequestStatsMiddleware:
+    """Замеряет запросы к базе, рендеринг шаблона и открытые соединения.
+
+    Время передаётся в заголовке Server-Timing и пишется одной строкой
+    JSON в журнал blog.instrumentation. Для запросов дольше
+    SLOW_REQUEST_THRESHOLD миллисекунд в журнал попадает и весь их SQL;
+    параметры запросов — только при уровне журнала DEBUG.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with collect_request_stats() as stats:
+            response = self.get_response(request)
+        total_time = stats.total_time
+        if settings.SERVER_TIMING_HEADER:
+            response['Server-Timing'] = format_server_timing(stats)
+        if settings.DB_CONNECTION_STATS_HEADER:
+            response['X-DB-Connections'] = format_connection_stats(stats)
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': getattr(request.resolver_match, 'view_name', None),
+            'status': response.status_code,
+            'queries': len(stats.queries),
+            'db_ms': round(stats.db_time * 1000, 1),
+            'template_ms': round(stats.render_time * 1000, 1),
+            'total_ms': round(total_time * 1000, 1),
+            'connections_opened': stats.connection_opens,
+        }, ensure_ascii=False))
+        if settings.N_PLUS_ONE_DETECTION != 'off':
+            self.check_repeated_queries(request, stats)
+        if total_time * 1000 >= settings.SLOW_REQUEST_THRESHOLD:
+            logger.warning(
+                'Медленный запрос %s %s: %.1f мс, SQL:\n%s',
+                request.method, request.get_full_path(), total_time * 1000,
+                format_queries(
+                    stats, with_params=logger.isEnabledFor(logging.DEBUG)
+                )
+            )
+        return response
+
+    @staticmethod
+    def check_repeated_queries(request, stats):
+        repeated = find_repeated_queries(
+            stats, settings.N_PLUS_ONE_THRESHOLD
+        )
+        if not repeated:
+            return
+        message = (
+            f'Повторяющиеся запросы (N+1) в {request.method} '
+            f'{request.get_full_path()}:\n'
+            f'{format_repeated_queries(repeated)}'
+        )
+        if settings.N_PLUS_ONE_DETECTION == 'raise':
+            raise NPlusOneError(message)
+        logger.warning(message)
+
+    def process_template_response(self, request, response):
+        stats = get_request_stats()
+        started = time.perf_counter()
+
+        def rendered(response):
+            stats.render_time += time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
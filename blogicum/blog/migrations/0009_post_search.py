@@ -0,0 +1,78 @@
+from django.db import migrations
+
+# SQL зафиксирован здесь, а не берётся из blog.search: изменения модуля
+# не должны менять уже применённую миграцию.
+INSTALL_SQL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_search USING fts5(
+        title, text,
+        content='blog_post', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS blog_post_search_insert
+    AFTER INSERT ON blog_post BEGIN
+        INSERT INTO blog_post_search(rowid, title, text) VALUES (
+            new.id,
+            replace(replace(new.title, 'ё', 'е'), 'Ё', 'Е'),
+            replace(replace(new.text, 'ё', 'е'), 'Ё', 'Е')
+        );
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS blog_post_search_delete
+    AFTER DELETE ON blog_post BEGIN
+        INSERT INTO blog_post_search(blog_post_search, rowid, title, text)
+        VALUES (
+            'delete', old.id,
+            replace(replace(old.title, 'ё', 'е'), 'Ё', 'Е'),
+            replace(replace(old.text, 'ё', 'е'), 'Ё', 'Е')
+        );
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS blog_post_search_update
+    AFTER UPDATE OF title, text ON blog_post BEGIN
+        INSERT INTO blog_post_search(blog_post_search, rowid, title, text)
+        VALUES (
+            'delete', old.id,
+            replace(replace(old.title, 'ё', 'е'), 'Ё', 'Е'),
+            replace(replace(old.text, 'ё', 'е'), 'Ё', 'Е')
+        );
+        INSERT INTO blog_post_search(rowid, title, text) VALUES (
+            new.id,
+            replace(replace(new.title, 'ё', 'е'), 'Ё', 'Е'),
+            replace(replace(new.text, 'ё', 'е'), 'Ё', 'Е')
+        );
+    END""",
+    "INSERT INTO blog_post_search(blog_post_search) VALUES ('delete-all')",
+    """INSERT INTO blog_post_search(rowid, title, text)
+    SELECT
+        id,
+        replace(replace(title, 'ё', 'е'), 'Ё', 'Е'),
+        replace(replace(text, 'ё', 'е'), 'Ё', 'Е')
+    FROM blog_post""",
+)
+
+UNINSTALL_SQL = (
+    'DROP TRIGGER IF EXISTS blog_post_search_insert',
+    'DROP TRIGGER IF EXISTS blog_post_search_delete',
+    'DROP TRIGGER IF EXISTS blog_post_search_update',
+    'DROP TABLE IF EXISTS blog_post_search',
+)
+
+
+def execute(statements):
+    def run(apps, schema_editor):
+        # FTS5 есть только в SQLite, на других базах поиск идёт через LIKE.
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql, params=None)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_task'),
+    ]
+
+    operations = [
+        migrations.RunPython(execute(INSTALL_SQL), execute(UNINSTALL_SQL)),
+    ]
@@ -0,0 +1,68 @@
+from django.db import migrations
+
+# SQL зафиксирован здесь, как и в 0009_post_search.
+INSTALL_SQL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS blog_comment_search USING fts5(
+        text,
+        content='blog_comment', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS blog_comment_search_insert
+    AFTER INSERT ON blog_comment BEGIN
+        INSERT INTO blog_comment_search(rowid, text) VALUES (
+            new.id, replace(replace(new.text, 'ё', 'е'), 'Ё', 'Е')
+        );
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS blog_comment_search_delete
+    AFTER DELETE ON blog_comment BEGIN
+        INSERT INTO blog_comment_search(blog_comment_search, rowid, text)
+        VALUES (
+            'delete', old.id,
+            replace(replace(old.text, 'ё', 'е'), 'Ё', 'Е')
+        );
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS blog_comment_search_update
+    AFTER UPDATE OF text ON blog_comment BEGIN
+        INSERT INTO blog_comment_search(blog_comment_search, rowid, text)
+        VALUES (
+            'delete', old.id,
+            replace(replace(old.text, 'ё', 'е'), 'Ё', 'Е')
+        );
+        INSERT INTO blog_comment_search(rowid, text) VALUES (
+            new.id, replace(replace(new.text, 'ё', 'е'), 'Ё', 'Е')
+        );
+    END""",
+    """INSERT INTO blog_comment_search(blog_comment_search)
+    VALUES ('delete-all')""",
+    """INSERT INTO blog_comment_search(rowid, text)
+    SELECT id, replace(replace(text, 'ё', 'е'), 'Ё', 'Е')
+    FROM blog_comment""",
+)
+
+UNINSTALL_SQL = (
+    'DROP TRIGGER IF EXISTS blog_comment_search_insert',
+    'DROP TRIGGER IF EXISTS blog_comment_search_delete',
+    'DROP TRIGGER IF EXISTS blog_comment_search_update',
+    'DROP TABLE IF EXISTS blog_comment_search',
+)
+
+
+def execute(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql, params=None)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(execute(INSTALL_SQL), execute(UNINSTALL_SQL)),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0010_comment_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadQuota',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Дата')),
+                ('uploaded', models.PositiveBigIntegerField(default=0, verbose_name='Загружено байт')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_quotas', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'квота загрузки фото',
+                'verbose_name_plural': 'Квоты загрузки фото',
+                'default_related_name': 'upload_quotas',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='uploadquota',
+            constraint=models.UniqueConstraint(fields=('user', 'date'), name='upload_quota_user_date_unique'),
+        ),
+    ]
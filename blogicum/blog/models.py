@@ -1,13 +1,38 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.contrib.auth import get_user_model
-from django.db import models
-from django.db.models import Count
+from django.db import models, router, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from .constants import MAX_TEXT_LENGTH, TITLE_LENGTH_LIMIT
+from .constants import (MAX_TEXT_LENGTH, POST_CARD_IMAGE_WIDTH,
+                        TITLE_LENGTH_LIMIT)
 
 
 User = get_user_model()
 
+_deleting_posts = ContextVar('deleting_posts', default=False)
+
+
+@contextmanager
+def deleting_posts():
+    """Удаление публикаций вместе с их комментариями.
+
+    Внутри блока каскадно удаляются только комментарии удаляемых
+    публикаций, поэтому их счётчики comment_count не обновляются.
+    """
+    token = _deleting_posts.set(True)
+    try:
+        yield
+    finally:
+        _deleting_posts.reset(token)
+
+
+def is_deleting_posts():
+    return _deleting_posts.get()
+
 
 class FilterQuerySet(models.QuerySet):
     def get_posts(
@@ -30,11 +55,25 @@ class FilterQuerySet(models.QuerySet):
                 'location'
             )
         if apply_annotate:
-            posts = posts.annotate(
-                comment_count=Count('comments')
-            ).order_by(*self.model._meta.ordering)
+            # Количество комментариев хранится в поле comment_count,
+            # агрегировать таблицу комментариев не нужно.
+            posts = posts.order_by(*self.model._meta.ordering)
         return posts
 
+    def delete(self):
+        with deleting_posts():
+            return super().delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def recount_comments(self):
+        return self.update(comment_count=Coalesce(Subquery(
+            Comment.objects.filter(post=OuterRef('pk')).order_by().values(
+                'post'
+            ).annotate(total=Count('pk')).values('total')
+        ), 0))
+
 
 class PublicationBaseModel(models.Model):
     is_published = models.BooleanField(
@@ -117,6 +156,21 @@ class Post(PublicationBaseModel):
         verbose_name='Категория'
     )
     image = models.ImageField('Фото', upload_to='posts_images', blank=True)
+    image_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Уменьшенные копии фото'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
     objects = FilterQuerySet.as_manager()
 
     class Meta(PublicationBaseModel.Meta):
@@ -124,10 +178,97 @@ class Post(PublicationBaseModel):
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
         default_related_name = 'posts'
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                condition=models.Q(is_published=True),
+                name='post_published_pub_date_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                condition=models.Q(is_published=True),
+                name='post_category_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title[:TITLE_LENGTH_LIMIT]
 
+    def save(self, *args, **kwargs):
+        # Задача на копии фото ставится в очередь сигналом post_save:
+        # публикация без неё не должна сохраниться.
+        using = kwargs.get('using') or router.db_for_write(
+            Post, instance=self
+        )
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with deleting_posts():
+            return super().delete(*args, **kwargs)
+
+    @property
+    def current_image_renditions(self):
+        # Копии заменённого фото не выводятся, пока не готовы новые.
+        if self.image_renditions.get('source') != (self.image.name or None):
+            return {}
+        return self.image_renditions
+
+    def get_image_srcset(self, extension):
+        return ', '.join(
+            f'{self.image.storage.url(name)} {width}w'
+            for width, name in self.current_image_renditions.get(
+                extension, ()
+            )
+        )
+
+    @property
+    def image_webp_srcset(self):
+        return self.get_image_srcset('webp')
+
+    @property
+    def image_jpeg_srcset(self):
+        return self.get_image_srcset('jpeg')
+
+    @property
+    def image_card_url(self):
+        # Наименьшая копия не уже карточки или самая широкая из копий.
+        renditions = self.current_image_renditions.get('jpeg')
+        if not renditions:
+            return self.image.url
+        for width, name in renditions:
+            if width >= POST_CARD_IMAGE_WIDTH:
+                return self.image.storage.url(name)
+        return self.image.storage.url(renditions[-1][1])
+
+    @property
+    def card_version(self):
+        # Всё, что выводится в карточке публикации, кроме неизменных полей.
+        category, location = self.category, self.location
+        return (
+            self.updated_at,
+            self.comment_count,
+            self.author.username,
+            category and (
+                category.slug, category.title, category.is_published
+            ),
+            location and (location.name, location.is_published),
+        )
+
+    @property
+    def is_visible(self):
+        # Те же условия, что и в FilterQuerySet.get_posts().
+        return (
+            self.is_published
+            and self.category is not None
+            and self.category.is_published
+            and self.pub_date < timezone.now()
+        )
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -151,6 +292,94 @@ class Comment(models.Model):
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_at_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:TITLE_LENGTH_LIMIT]
+
+
+class Task(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Ожидает'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(
+        max_length=MAX_TEXT_LENGTH,
+        verbose_name='Функция'
+    )
+    payload = models.JSONField(default=dict, verbose_name='Аргументы')
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Состояние'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Запустить не раньше'
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Взята в работу'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_at',)
+        indexes = (
+            models.Index(
+                fields=('status', 'run_at'),
+                name='task_status_run_at_idx'
+            ),
+        )
+
+    def __str__(self):
+        return self.name[:TITLE_LENGTH_LIMIT]
+
+
+class UploadQuota(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь'
+    )
+    date = models.DateField(verbose_name='Дата')
+    uploaded = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Загружено байт'
+    )
+
+    class Meta:
+        verbose_name = 'квота загрузки фото'
+        verbose_name_plural = 'Квоты загрузки фото'
+        default_related_name = 'upload_quotas'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'date'),
+                name='upload_quota_user_date_unique'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.user} {self.date}'
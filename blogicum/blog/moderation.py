@@ -0,0 +1,83 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import router, transaction
+from django.utils import timezone
+
+from .cache import invalidate_posts
+from .constants import MODERATION_BATCH_SIZE
+from .models import Comment, Post
+
+
+def iter_pk_ranges(queryset, batch_size=MODERATION_BATCH_SIZE):
+    """Делит выборку на части не больше batch_size строк.
+
+    Границы частей берутся из id, действительно попавших в выборку,
+    поэтому разреженные id не дают пустых частей. Каждая часть — тот же
+    queryset с условием на диапазон id: её изменение выполняется одним
+    UPDATE или DELETE по индексу первичного ключа и не держит блокировку
+    на всей выборке.
+    """
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        # Следующая часть ищется после последнего id, а не по смещению:
+        # изменённые или удалённые строки могут выпасть из выборки.
+        ids = pks if last is None else pks.filter(pk__gt=last)
+        bounds = list(ids[:batch_size])
+        if not bounds:
+            return
+        last = bounds[-1]
+        yield queryset.filter(pk__gte=bounds[0], pk__lte=last)
+
+
+def update_posts(queryset, batch_size=MODERATION_BATCH_SIZE, **values):
+    """Изменяет публикации пачками без сигналов save.
+
+    updated_at меняется вместе с данными: от него зависят Last-Modified
+    страниц и ключи кэша карточек. Кэш лент сбрасывается один раз
+    на пачку.
+    """
+    updated = 0
+    queryset = queryset.using(router.db_for_write(queryset.model))
+    for chunk in iter_pk_ranges(queryset, batch_size):
+        count = chunk.order_by().update(**values, updated_at=timezone.now())
+        if count:
+            invalidate_posts()
+        updated += count
+    return updated
+
+
+def delete_posts(queryset, batch_size=MODERATION_BATCH_SIZE):
+    """Удаляет публикации вместе с комментариями пачками.
+
+    Каскадное удаление Django загружает каждый объект, чтобы отправить
+    сигналы; здесь на пачку приходится по одному DELETE для комментариев
+    и публикаций. Обработчики сигналов удаления лишь сбрасывают кэш
+    и поправляют счётчик комментариев удаляемой публикации, поэтому
+    кэш сбрасывается один раз на пачку, а файлы фото без публикаций
+    удаляет команда collect_media.
+
+    _raw_delete не учитывает on_delete, поэтому новая связь с Post,
+    кроме комментариев, должна удаляться здесь же явно; до тех пор
+    функция отказывается работать с ImproperlyConfigured.
+    """
+    relations = {
+        relation.related_model for relation in Post._meta.related_objects
+    }
+    if relations != {Comment} or Comment._meta.related_objects:
+        raise ImproperlyConfigured(
+            f'Связи с публикацией: {relations}; delete_posts удаляет '
+            'вместе с публикациями только комментарии.'
+        )
+    deleted = 0
+    using = router.db_for_write(queryset.model)
+    for chunk in iter_pk_ranges(queryset.using(using), batch_size):
+        ids = chunk.order_by().values('pk')
+        with transaction.atomic(using=using):
+            # Закрытый QuerySet._raw_delete(using) проверен с Django 3.2:
+            # один DELETE без Collector и сигналов, возвращает число строк.
+            Comment.objects.filter(post__in=ids)._raw_delete(using)
+            count = chunk.order_by()._raw_delete(using)
+        if count:
+            invalidate_posts()
+        deleted += count
+    return deleted
@@ -0,0 +1,129 @@
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class CursorPage:
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, next_cursor=None,
+                 previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Постраничный вывод по ключу сортировки без COUNT(*) и OFFSET.
+
+    Курсор хранит значения полей сортировки крайнего объекта страницы,
+    поэтому стоимость запроса не зависит от глубины страницы.
+    Последнее поле ``ordering`` обязано быть уникальным.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-pub_date', '-id')):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [field.lstrip('-') for field in ordering]
+        self.descending = [field.startswith('-') for field in ordering]
+
+    def encode_cursor(self, obj, previous=False):
+        position = [str(getattr(obj, field)) for field in self.fields]
+        data = json.dumps({'p': position, 'r': previous})
+        return base64.urlsafe_b64encode(
+            data.encode()
+        ).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            data = json.loads(base64.urlsafe_b64decode(
+                cursor + '=' * (-len(cursor) % 4)
+            ))
+            if len(data['p']) != len(self.fields):
+                return None, False
+            values = [
+                self.queryset.model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.fields, data['p'])
+            ]
+            return values, bool(data.get('r'))
+        except (binascii.Error, ValidationError, ValueError, TypeError,
+                KeyError):
+            return None, False
+
+    def _keyset_filter(self, values, previous):
+        conditions = []
+        for index, field in enumerate(self.fields):
+            lookup = 'lt' if self.descending[index] != previous else 'gt'
+            condition = Q(**{f'{field}__{lookup}': values[index]})
+            for prev_field, prev_value in zip(self.fields, values[:index]):
+                condition &= Q(**{prev_field: prev_value})
+            conditions.append(condition)
+        return reduce(or_, conditions)
+
+    def _reversed_ordering(self):
+        return [
+            field if descending else f'-{field}'
+            for field, descending in zip(self.fields, self.descending)
+        ]
+
+    def get_page(self, cursor=None):
+        values, previous = (
+            self.decode_cursor(cursor) if cursor else (None, False)
+        )
+        if values is None:
+            queryset = self.queryset.order_by(*self.ordering)
+        elif previous:
+            queryset = self.queryset.filter(
+                self._keyset_filter(values, previous=True)
+            ).order_by(*self._reversed_ordering())
+        else:
+            queryset = self.queryset.filter(
+                self._keyset_filter(values, previous=False)
+            ).order_by(*self.ordering)
+        objects = list(queryset[:self.per_page + 1])
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if previous:
+            objects.reverse()
+            has_next, has_previous = bool(objects), has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+        return CursorPage(
+            objects,
+            self,
+            next_cursor=(
+                self.encode_cursor(objects[-1]) if has_next else None
+            ),
+            previous_cursor=(
+                self.encode_cursor(objects[0], previous=True)
+                if has_previous and objects else None
+            )
+        )
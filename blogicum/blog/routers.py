@@ -0,0 +1,64 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_use_primary = ContextVar('use_primary', default=False)
+_replica = ContextVar('replica', default=None)
+
+
+@contextmanager
+def use_primary():
+    """Направляет чтения внутри блока в основную базу."""
+    token = _use_primary.set(True)
+    try:
+        yield
+    finally:
+        _use_primary.reset(token)
+
+
+@contextmanager
+def use_replica():
+    """Направляет чтения внутри блока в одну случайно выбранную реплику.
+
+    Запросы одной страницы видят одно состояние данных: COUNT
+    и строки выборки не берутся из реплик с разным отставанием.
+    """
+    replicas = settings.DATABASE_REPLICAS
+    token = _replica.set(random.choice(replicas) if replicas else None)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Читает из реплик из DATABASE_REPLICAS, пишет в основную базу.
+
+    Без реплик или внутри use_primary() чтения тоже идут в основную базу,
+    внутри use_replica() — в выбранную для блока реплику.
+    Миграции применяются только к ней: реплики получают схему вместе
+    с данными при репликации.
+    """
+
+    def db_for_read(self, model, **hints):
+        # Таблица DatabaseCache: версия кэша с реплики могла устареть.
+        if model._meta.app_label == 'django_cache':
+            return DEFAULT_DB_ALIAS
+        if _use_primary.get() or not settings.DATABASE_REPLICAS:
+            return DEFAULT_DB_ALIAS
+        return _replica.get() or random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
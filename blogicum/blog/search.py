@@ -0,0 +1,157 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .constants import (SEARCH_MAX_WORDS, SEARCH_TEXT_WEIGHT,
+                        SEARCH_TITLE_WEIGHT)
+
+SEARCH_TABLE = 'blog_post_search'
+COMMENT_SEARCH_TABLE = 'blog_comment_search'
+
+
+def fold(value):
+    """SQL-выражение: «ё» заменена на «е».
+
+    remove_diacritics в unicode61 действует только на латиницу, поэтому
+    «ё» приводится к «е» до индексации, а строка поиска — в get_search_words.
+    """
+    return f"replace(replace({value}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+# Таблицы FTS5 с внешним содержимым: хранят только индекс, тексты
+# берутся из исходной таблицы. unicode61 приводит кириллицу к нижнему
+# регистру. Триггеры обновляют индекс при любом изменении строк, включая
+# массовые UPDATE и DELETE.
+SEARCH_INDEXES = {
+    SEARCH_TABLE: ('blog_post', ('title', 'text')),
+    COMMENT_SEARCH_TABLE: ('blog_comment', ('text',)),
+}
+
+
+def make_install_sql(index):
+    table, columns = SEARCH_INDEXES[index]
+    names = ', '.join(columns)
+    old = ', '.join(fold(f'old.{column}') for column in columns)
+    new = ', '.join(fold(f'new.{column}') for column in columns)
+    insert = (
+        f'INSERT INTO {index}(rowid, {names}) VALUES (new.id, {new});'
+    )
+    delete = (
+        f'INSERT INTO {index}({index}, rowid, {names}) '
+        f"VALUES ('delete', old.id, {old});"
+    )
+    return (
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5(
+            {names},
+            content='{table}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {index}_insert
+        AFTER INSERT ON {table} BEGIN {insert} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {index}_delete
+        AFTER DELETE ON {table} BEGIN {delete} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {index}_update
+        AFTER UPDATE OF {names} ON {table} BEGIN {delete} {insert} END""",
+    )
+
+
+def make_rebuild_sql(index):
+    # Команда 'rebuild' индексировала бы тексты без замены «ё», поэтому
+    # индекс очищается и заполняется тем же выражением, что в триггерах.
+    table, columns = SEARCH_INDEXES[index]
+    return (
+        f"INSERT INTO {index}({index}) VALUES ('delete-all')",
+        f"""INSERT INTO {index}(rowid, {', '.join(columns)})
+        SELECT id, {', '.join(fold(column) for column in columns)}
+        FROM {table}""",
+    )
+
+
+def make_uninstall_sql(index):
+    return (
+        f'DROP TRIGGER IF EXISTS {index}_insert',
+        f'DROP TRIGGER IF EXISTS {index}_delete',
+        f'DROP TRIGGER IF EXISTS {index}_update',
+        f'DROP TABLE IF EXISTS {index}',
+    )
+
+
+def install_search_index(connection, indexes=SEARCH_INDEXES):
+    """Создаёт индексы и триггеры, если их нет, и заполняет индексы заново.
+
+    Миграции SQLite, пересоздающие исходную таблицу, удаляют и триггеры,
+    поэтому после них нужно запустить rebuild_search_index.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for index in indexes:
+            for sql in make_install_sql(index) + make_rebuild_sql(index):
+                cursor.execute(sql)
+
+
+def uninstall_search_index(connection, indexes=SEARCH_INDEXES):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for index in indexes:
+            for sql in make_uninstall_sql(index):
+                cursor.execute(sql)
+
+
+def get_search_words(text):
+    text = text.lower().replace('ё', 'е')
+    return re.findall(r'\w+', text)[:SEARCH_MAX_WORDS]
+
+
+def make_match_query(words):
+    """Запрос FTS5: все слова, каждое как префикс.
+
+    Стемминга русского языка в FTS5 нет, префикс «публикац» находит
+    и «публикация», и «публикации». Слова берутся в кавычки, поэтому
+    операторы FTS5 из строки поиска не интерпретируются.
+    """
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_posts(posts, text):
+    """Публикации из posts, подходящие под строку поиска, по релевантности."""
+    words = get_search_words(text)
+    if not words:
+        return posts.none()
+    if connections[posts.db].vendor != 'sqlite':
+        condition = Q()
+        for word in words:
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+        return posts.filter(condition)
+    table = posts.model._meta.db_table
+    return posts.extra(
+        tables=[SEARCH_TABLE],
+        where=[
+            f'{SEARCH_TABLE}.rowid = {table}.id',
+            f'{SEARCH_TABLE} MATCH %s',
+        ],
+        params=[make_match_query(words)],
+        select={'search_rank': (
+            f'bm25({SEARCH_TABLE}, '
+            f'{SEARCH_TITLE_WEIGHT}, {SEARCH_TEXT_WEIGHT})'
+        )},
+    ).order_by('search_rank', '-pub_date')
+
+
+def filter_by_search_index(queryset, index, text):
+    """Строки queryset, найденные в индексе index, без ранжирования.
+
+    Для списков в админке: порядок задаёт сам список, а подзапрос
+    к индексу заменяет сканирование таблицы через LIKE '%...%'.
+    """
+    words = get_search_words(text)
+    if not words:
+        return queryset
+    return queryset.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {index} WHERE {index} MATCH %s',
+        (make_match_query(words),)
+    ))
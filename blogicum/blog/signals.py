@@ -0,0 +1,159 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import get_post_namespaces, invalidate_posts
+from .connections import close_unusable_connections
+from .images import refresh_post_renditions
+from .instrumentation import record_connection_open
+from .models import (Category, Comment, Location, Post, User,
+                     is_deleting_posts)
+from .tasks import enqueue
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, using, **kwargs):
+    # В админке комментарий можно перенести к другой публикации.
+    instance._previous_post_id = None if instance.pk is None else (
+        Comment.objects.using(using).filter(pk=instance.pk).values_list(
+            'post_id', flat=True
+        ).first()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, **kwargs):
+    # updated_at публикации меняется и при редактировании комментария:
+    # по нему вычисляется Last-Modified страницы публикации.
+    now = timezone.now()
+    previous_post_id = instance._previous_post_id
+    moved = previous_post_id not in (None, instance.post_id)
+    if moved:
+        Post.objects.filter(pk=previous_post_id).update(
+            comment_count=Greatest(F('comment_count') - 1, 0),
+            updated_at=now
+        )
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=F('comment_count') + int(created or moved),
+        updated_at=now
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, **kwargs):
+    # Комментарии удаляемой публикации уходят вместе с ней: иначе
+    # на каждый из них пришлось бы по UPDATE уже удалённой строки.
+    if is_deleting_posts():
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F('comment_count') - 1, 0),
+        updated_at=timezone.now()
+    )
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_delete, sender=Post)
+def remember_post_namespaces(sender, instance, using, **kwargs):
+    # Публикация могла сменить категорию или автора: сбросить нужно
+    # и ленты, в которых она выводилась до изменения.
+    instance._cache_namespaces = get_post_namespaces(
+        instance.pk, using=using
+    )
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post(sender, instance, using, **kwargs):
+    invalidate_posts(
+        *instance._cache_namespaces,
+        *get_post_namespaces(instance.pk, using=using)
+    )
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post(sender, instance, **kwargs):
+    invalidate_posts(*instance._cache_namespaces)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_commented_post(sender, instance, using, **kwargs):
+    if is_deleting_posts():
+        # Кэш сбросит сигнал удаления самой публикации.
+        return
+    # Комментарии выводятся на странице публикации, а их число —
+    # в карточке в лентах. Перенесённый комментарий меняет и прежнюю.
+    invalidate_posts(*get_post_namespaces(
+        instance.post_id, getattr(instance, '_previous_post_id', None),
+        using=using
+    ))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_cached_posts(sender, **kwargs):
+    # Категории и места выводятся в карточках публикаций любой ленты.
+    invalidate_posts()
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, using, update_fields, **kwargs):
+    instance._previous_username = None
+    if instance.pk is not None and update_fields != {'last_login'}:
+        instance._previous_username = User.objects.using(using).filter(
+            pk=instance.pk
+        ).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def invalidate_saved_user(sender, instance, update_fields, **kwargs):
+    # Вход на сайт обновляет только last_login, который нигде не выводится.
+    if update_fields == {'last_login'}:
+        return
+    previous = instance._previous_username
+    invalidate_posts(*{
+        f'profile:{username}'
+        for username in (previous, instance.username) if username
+    })
+    if previous is not None and previous != instance.username:
+        # Имя автора выводится в карточках и комментариях любой ленты.
+        invalidate_posts()
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    invalidate_posts(f'profile:{instance.username}')
+
+
+@receiver(post_save, sender=Post)
+def update_image_renditions(sender, instance, **kwargs):
+    # Копии фото создаются фоновым обработчиком run_worker.
+    if instance.image_renditions.get('source') != (
+            instance.image.name or None):
+        enqueue(refresh_post_renditions, post_id=instance.pk)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    # Напрямую через sqlite3, чтобы настройки не попадали в журнал запросов.
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def count_connection_open(sender, connection, **kwargs):
+    record_connection_open()
+
+
+@receiver(request_started)
+def check_connections(sender, **kwargs):
+    close_unusable_connections()
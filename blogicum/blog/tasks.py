@@ -0,0 +1,92 @@
+import traceback
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .constants import (TASK_CLAIM_CANDIDATES, TASK_LOCK_TIMEOUT,
+                        TASK_MAX_ATTEMPTS, TASK_RETRY_DELAY)
+from .models import Task
+
+
+def task(func):
+    """Разрешает выполнять функцию в фоновом обработчике run_worker."""
+    func.is_task = True
+    func.task_name = f'{func.__module__}.{func.__qualname__}'
+    return func
+
+
+def enqueue(func, **payload):
+    """Ставит задачу в очередь; аргументы должны сериализоваться в JSON.
+
+    Задача сохраняется в текущей транзакции, если вызывающий код её
+    открыл: тогда обработчик не увидит задачу раньше данных, которые
+    ей нужны, а данные не сохранятся без задачи. Post.save() выполняется
+    в транзакции вместе со своими сигналами.
+    """
+    return Task.objects.create(name=func.task_name, payload=payload)
+
+
+def requeue_stale():
+    """Возвращает в очередь задачи обработчиков, завершившихся аварийно."""
+    return Task.objects.filter(
+        status=Task.RUNNING,
+        locked_at__lt=timezone.now() - timedelta(seconds=TASK_LOCK_TIMEOUT)
+    ).update(status=Task.PENDING, locked_at=None)
+
+
+def claim_next():
+    """Забирает ближайшую задачу; условный UPDATE не даёт двум
+    обработчикам взять одну и ту же задачу.
+    """
+    for task_id in Task.objects.filter(
+        status=Task.PENDING, run_at__lte=timezone.now()
+    ).values_list('id', flat=True)[:TASK_CLAIM_CANDIDATES]:
+        if Task.objects.filter(id=task_id, status=Task.PENDING).update(
+            status=Task.RUNNING,
+            locked_at=timezone.now(),
+            attempts=F('attempts') + 1
+        ):
+            return Task.objects.get(id=task_id)
+    return None
+
+
+def run_task(job):
+    try:
+        func = import_string(job.name)
+        if not getattr(func, 'is_task', False):
+            raise ImportError(f'{job.name} не является фоновой задачей.')
+        func(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= TASK_MAX_ATTEMPTS:
+            job.status = Task.FAILED
+        else:
+            # Интервал между попытками удваивается.
+            job.status = Task.PENDING
+            job.run_at = timezone.now() + timedelta(
+                seconds=TASK_RETRY_DELAY * 2 ** (job.attempts - 1)
+            )
+        job.locked_at = None
+        job.save(update_fields=(
+            'status', 'run_at', 'locked_at', 'last_error'
+        ))
+        return False
+    job.delete()
+    return True
+
+
+def run_pending():
+    """Выполняет все задачи, срок которых наступил; возвращает
+    количество успешных и неудачных запусков.
+    """
+    succeeded = failed = 0
+    job = claim_next()
+    while job is not None:
+        if run_task(job):
+            succeeded += 1
+        else:
+            failed += 1
+        job = claim_next()
+    return succeeded, failed
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.template.loader import get_template
+
+
+def warm_templates():
+    """Компилирует все шаблоны проекта и возвращает их имена.
+
+    Cached loader запоминает результат в памяти процесса, поэтому вызывать
+    функцию нужно в том процессе, который будет обслуживать запросы.
+    """
+    names = sorted(
+        path.relative_to(settings.TEMPLATES_DIR).as_posix()
+        for path in settings.TEMPLATES_DIR.rglob('*.html')
+    )
+    for name in names:
+        get_template(name)
+    return names
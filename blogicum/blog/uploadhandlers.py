@@ -0,0 +1,131 @@
+from io import BytesIO
+
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.template.defaultfilters import filesizeformat
+from django.utils import timezone
+from PIL import Image
+
+from .constants import (POST_IMAGE_DAILY_QUOTA, POST_IMAGE_FORMATS,
+                        POST_IMAGE_HEADER_LIMIT, POST_IMAGE_MAX_PIXELS,
+                        POST_IMAGE_MAX_SIDE, POST_IMAGE_MAX_SIZE)
+from .models import UploadQuota
+
+
+def get_uploaded_bytes(user):
+    """Сколько байт фото пользователь загрузил за текущие сутки."""
+    return UploadQuota.objects.filter(
+        user=user, date=timezone.localdate()
+    ).values_list('uploaded', flat=True).first() or 0
+
+
+def add_uploaded_bytes(user, size):
+    # Квота хранится в базе: она общая для всех процессов
+    # и не теряется при перезапуске.
+    today = timezone.localdate()
+    quotas = UploadQuota.objects.filter(user=user, date=today)
+    if quotas.update(uploaded=F('uploaded') + size):
+        return
+    try:
+        with transaction.atomic():
+            UploadQuota.objects.create(user=user, date=today, uploaded=size)
+    except IntegrityError:
+        # Запись за сегодня успел создать параллельный запрос.
+        quotas.update(uploaded=F('uploaded') + size)
+    else:
+        UploadQuota.objects.filter(user=user, date__lt=today).delete()
+
+
+class PostImageUploadHandler(FileUploadHandler):
+    """Проверяет фото публикации, пока оно ещё передаётся.
+
+    Заголовок файла разбирается по первым блокам, поэтому не-изображения,
+    картинки слишком большого разрешения и превышение размера или суточной
+    квоты отклоняются сразу: остаток файла пропускается без записи на диск.
+    Причина отказа попадает в ``errors`` и выводится формой.
+    """
+
+    field = 'image'
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.errors = {}
+        self.active = False
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.active = field_name == self.field
+        if not self.active:
+            return
+        self.header = b''
+        self.header_checked = False
+        self.available = POST_IMAGE_MAX_SIZE
+        # Запрос анонима отклонит LoginRequiredMixin, квоту не считаем.
+        if self.request.user.is_authenticated:
+            self.available = min(
+                POST_IMAGE_MAX_SIZE,
+                POST_IMAGE_DAILY_QUOTA
+                - get_uploaded_bytes(self.request.user)
+            )
+        if self.content_length is not None:
+            self.check_size(self.content_length)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.active:
+            self.check_size(start + len(raw_data))
+            if not self.header_checked:
+                self.check_header(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if self.active:
+            if self.request.user.is_authenticated:
+                add_uploaded_bytes(self.request.user, file_size)
+            self.active = False
+
+    def reject(self, message):
+        self.errors[self.field_name] = message
+        self.active = False
+        raise SkipFile(message)
+
+    def check_size(self, size):
+        if size <= self.available:
+            return
+        if self.available < POST_IMAGE_MAX_SIZE:
+            self.reject(
+                'Превышена суточная квота загрузки фото '
+                f'({filesizeformat(POST_IMAGE_DAILY_QUOTA)}).'
+            )
+        self.reject(
+            'Размер фото не должен превышать '
+            f'{filesizeformat(POST_IMAGE_MAX_SIZE)}.'
+        )
+
+    def check_header(self, raw_data):
+        self.header += raw_data
+        try:
+            image = Image.open(BytesIO(self.header))
+        except Image.DecompressionBombError:
+            self.reject_resolution()
+        except OSError:
+            if len(self.header) >= POST_IMAGE_HEADER_LIMIT:
+                self.reject('Загрузите корректное изображение.')
+            return
+        self.header_checked = True
+        self.header = b''
+        if image.format not in POST_IMAGE_FORMATS:
+            self.reject(
+                'Поддерживаются форматы: '
+                f'{", ".join(POST_IMAGE_FORMATS)}.'
+            )
+        width, height = image.size
+        if (max(width, height) > POST_IMAGE_MAX_SIDE
+                or width * height > POST_IMAGE_MAX_PIXELS):
+            self.reject_resolution()
+
+    def reject_resolution(self):
+        self.reject(
+            'Разрешение фото не должно превышать '
+            f'{POST_IMAGE_MAX_SIDE}px по стороне.'
+        )
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 
 app_name = 'blog'
@@ -8,8 +8,22 @@ app_name = 'blog'
 urlpatterns = [
     path('', views.PostListView.as_view(),
          name='post_list'),
+    path('feeds/rss/', feeds.PostsFeed(), name='posts_rss'),
+    path('feeds/atom/', feeds.PostsAtomFeed(), name='posts_atom'),
+    path('category/<slug:category_slug>/rss/', feeds.CategoryPostsFeed(),
+         name='category_rss'),
+    path('category/<slug:category_slug>/atom/',
+         feeds.CategoryPostsAtomFeed(), name='category_atom'),
+    path('profile/<str:username>/rss/', feeds.AuthorPostsFeed(),
+         name='profile_rss'),
+    path('profile/<str:username>/atom/', feeds.AuthorPostsAtomFeed(),
+         name='profile_atom'),
     path('posts/<int:post_id>/', views.PostDetailView.as_view(),
          name='post_detail'),
+    path('posts/<int:post_id>/comments/', views.CommentListView.as_view(),
+         name='post_comments'),
+    path('search/', views.PostSearchView.as_view(),
+         name='search'),
     path('category/<slug:category_slug>/', views.CategoryListView.as_view(),
          name='category_posts'),
     path('profile/<str:username>/', views.ProfileDetailView.as_view(),
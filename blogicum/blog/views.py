@@ -1,98 +1,305 @@
+import hashlib
+
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.core.paginator import Paginator
+from django.core.paginator import Page, Paginator
+from django.http import Http404
+from django.middleware.csrf import get_token
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
-from django.views.generic import (CreateView, DeleteView,
-                                  DetailView, ListView, UpdateView)
-
-from .constants import POSTS_PER_PAGE_LIMIT
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag, urlencode
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.generic import (CreateView, DeleteView, DetailView,
+                                  ListView, TemplateView, UpdateView)
+
+from .cache import get_or_set_posts, make_posts_etag, make_posts_key
+from .constants import COMMENTS_PER_PAGE_LIMIT, POSTS_PER_PAGE_LIMIT
 from .forms import CommentForm, PostForm
 from .models import Category, Comment, Post
+from .pagination import CursorPage, CursorPaginator
+from .search import search_posts
+from .uploadhandlers import PostImageUploadHandler
+
 
+class CachedObjectMixin:
+    """Запоминает объект, которому принадлежит страница, на время запроса.
 
-class OnlyAuthorMixin(UserPassesTestMixin):
+    Повторные вызовы get_object() из проверки прав, обработчиков
+    и get_context_data() не выполняют новых запросов к базе.
+    """
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_cached_object'):
+            self._cached_object = self.find_object()
+        return self._cached_object
+
+    def find_object(self):
+        return super().get_object()
+
+
+class OnlyAuthorMixin(CachedObjectMixin, UserPassesTestMixin):
     def test_func(self):
-        return self.request.user == self.get_object().author
+        return self.get_object().author_id == self.request.user.id
+
 
+class ConditionalGetMixin:
+    """Отвечает 304 Not Modified, не отрисовывая шаблон,
+    если у клиента уже есть актуальная версия страницы.
+    """
 
-class PostListView(ListView):
+    def get_validators(self):
+        """Возвращает ETag и дату последнего изменения страницы."""
+        return None, None
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        etag = etag and quote_etag(etag)
+        last_modified = last_modified and int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if etag and not response.has_header('ETag'):
+            response['ETag'] = etag
+        if last_modified and not response.has_header('Last-Modified'):
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get_viewer_key(self):
+        # Шапка и кнопки страницы зависят от пользователя.
+        user = self.request.user
+        return user.pk, user.get_username()
+
+
+class PostPaginationMixin:
+    paginate_by = POSTS_PER_PAGE_LIMIT
+
+    def get_feed(self):
+        """Пространство кэша ленты или None, если ленту не кэшируем."""
+        return None
+
+    def paginate_posts(self, posts):
+        if settings.BLOG_CURSOR_PAGINATION:
+            return self.paginate_by_cursor(posts, self.get_feed())
+        return self.paginate_by_number(posts, self.get_feed())
+
+    def paginate_by_cursor(self, posts, feed):
+        paginator = CursorPaginator(posts, self.paginate_by)
+        position = self.request.GET.get('cursor') or ''
+        if feed is None:
+            return paginator.get_page(position)
+
+        def build_page():
+            page = paginator.get_page(position)
+            return {
+                'object_list': page.object_list,
+                'next_cursor': page.next_cursor,
+                'previous_cursor': page.previous_cursor,
+            }
+
+        data = get_or_set_posts(
+            make_posts_key(feed, 'cursor', position), build_page
+        )
+        return CursorPage(paginator=paginator, **data)
+
+    def paginate_by_number(self, posts, feed):
+        paginator = Paginator(posts, self.paginate_by)
+        position = self.request.GET.get('page', 1)
+        if feed is None:
+            return paginator.get_page(position)
+
+        def build_page():
+            page = paginator.get_page(position)
+            return {
+                'object_list': list(page.object_list),
+                'number': page.number,
+                'count': paginator.count,
+            }
+
+        data = get_or_set_posts(
+            make_posts_key(feed, 'page', position), build_page
+        )
+        paginator.count = data['count']
+        return Page(data['object_list'], data['number'], paginator)
+
+    def paginate_queryset(self, queryset, page_size):
+        page = self.paginate_posts(queryset)
+        return (
+            page.paginator, page, page.object_list, page.has_other_pages()
+        )
+
+
+class PostListView(ConditionalGetMixin, PostPaginationMixin, ListView):
     model = Post
-    queryset = Post.objects.get_posts()
     template_name = 'blog/post_list.html'
-    paginate_by = POSTS_PER_PAGE_LIMIT
     context_object_name = 'post_list'
 
+    def get_feed(self):
+        return 'index'
+
+    def get_queryset(self):
+        # Граница pub_date — время запроса, а не загрузки модуля.
+        return Post.objects.get_posts()
+
+    def get_validators(self):
+        return make_posts_etag(
+            self.get_feed(), self.request.get_full_path(),
+            *self.get_viewer_key()
+        ), None
+
 
-class PostDetailView(DetailView):
+class VisiblePostMixin(CachedObjectMixin):
+    def find_object(self):
+        post = get_object_or_404(Post.objects.get_posts(
+            apply_filters=False,
+            apply_annotate=False
+        ), pk=self.kwargs['post_id'])
+        if self.request.user == post.author or post.is_visible:
+            return post
+        raise Http404
+
+    def get_comments_page(self, post):
+        return CursorPaginator(
+            post.comments.select_related('author'),
+            COMMENTS_PER_PAGE_LIMIT,
+            ordering=('created_at', 'id')
+        ).get_page(self.request.GET.get('cursor'))
+
+
+class PostDetailView(ConditionalGetMixin, VisiblePostMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
     context_object_name = 'post'
     slug_field = 'id'
     slug_url_kwarg = 'post_id'
 
-    def get_object(self, queryset=None):
-        queryset = queryset or self.get_queryset()
-        post = get_object_or_404(queryset, pk=self.kwargs['post_id'])
-        if self.request.user == post.author:
-            return post
-        return get_object_or_404(queryset.get_posts(
-            apply_select_related=False,
-            apply_annotate=False
-        ), pk=self.kwargs['post_id'])
+    def get_validators(self):
+        # updated_at меняется и при изменении комментариев публикации.
+        post = self.get_object()
+        # Форма комментария содержит CSRF-токен, секрет которого меняется
+        # при новом входе: страница со старым токеном не годится. Сам
+        # токен маскируется заново при каждом вызове, поэтому в ETag
+        # идёт значение cookie с секретом.
+        token = None
+        if self.request.user.is_authenticated:
+            get_token(self.request)
+            token = self.request.META['CSRF_COOKIE']
+        return hashlib.md5(str((
+            post.card_version,
+            self.request.get_full_path(),
+            *self.get_viewer_key(),
+            token,
+        )).encode()).hexdigest(), post.updated_at
 
     def get_context_data(self, **kwargs):
         return super().get_context_data(
             **kwargs,
-            comments=self.object.comments.all(),
+            comments=self.get_comments_page(self.object),
             form=CommentForm()
         )
 
 
-class CategoryListView(ListView):
+class CommentListView(VisiblePostMixin, TemplateView):
+    template_name = 'includes/comment_list.html'
+
+    def get_context_data(self, **kwargs):
+        post = self.get_object()
+        return super().get_context_data(
+            **kwargs,
+            post=post,
+            comments=self.get_comments_page(post)
+        )
+
+
+class CategoryListView(ConditionalGetMixin, CachedObjectMixin,
+                       PostPaginationMixin, ListView):
     model = Category
     template_name = 'blog/category.html'
     context_object_name = 'post_list'
-    paginate_by = POSTS_PER_PAGE_LIMIT
 
-    def get_category(self):
+    def get_validators(self):
+        # Скрытой категории — 404, а не 304 по устаревшему ETag.
+        self.get_object()
+        return make_posts_etag(
+            self.get_feed(), self.request.get_full_path(),
+            *self.get_viewer_key()
+        ), None
+
+    def find_object(self):
         return get_object_or_404(
             Category,
             slug=self.kwargs['category_slug'],
             is_published=True
         )
 
+    def get_feed(self):
+        return f'category:{self.kwargs["category_slug"]}'
+
     def get_queryset(self):
-        return self.get_category().posts.get_posts()
+        return self.get_object().posts.get_posts()
 
     def get_context_data(self, **kwargs):
         return super().get_context_data(
             **kwargs,
-            category=self.get_category()
+            category=self.get_object()
         )
 
 
-class ProfileDetailView(DetailView):
+class PostSearchView(ListView):
+    template_name = 'blog/search.html'
+    context_object_name = 'post_list'
+    paginate_by = POSTS_PER_PAGE_LIMIT
+
+    def get_search_text(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        return search_posts(Post.objects.get_posts(), self.get_search_text())
+
+    def get_context_data(self, **kwargs):
+        query = self.get_search_text()
+        return super().get_context_data(
+            **kwargs,
+            query=query,
+            page_query=f'{urlencode({"q": query})}&'
+        )
+
+
+class ProfileDetailView(ConditionalGetMixin, CachedObjectMixin,
+                        PostPaginationMixin, DetailView):
     model = User
     template_name = 'blog/profile.html'
     slug_field = 'username'
     slug_url_kwarg = 'username'
     context_object_name = 'profile'
 
-    def get_author(self):
-        return get_object_or_404(
-            User,
-            **{self.slug_field: self.kwargs[self.slug_url_kwarg]}
-        )
+    def get_validators(self):
+        profile = self.get_object()
+        return make_posts_etag(
+            f'profile:{profile.username}',
+            self.request.get_full_path(),
+            profile.get_full_name(),
+            profile.is_staff,
+            *self.get_viewer_key()
+        ), None
+
+    def get_feed(self):
+        if self.request.user == self.object:
+            return None
+        return f'profile:{self.object.username}'
 
     def get_context_data(self, **kwargs):
         return super().get_context_data(
             **kwargs,
-            page_obj=Paginator(
-                self.get_author().posts.get_posts(
-                    apply_filters=self.request.user != self.get_author(),),
-                POSTS_PER_PAGE_LIMIT
-            ).get_page(self.request.GET.get('page', 1))
+            page_obj=self.paginate_posts(
+                self.object.posts.get_posts(
+                    apply_filters=self.request.user != self.object,)
+            )
         )
 
 
@@ -110,7 +317,29 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostImageUploadMixin:
+    """Проверяет фото публикации до того, как оно загружено целиком.
+
+    Обработчик загрузки нужно подключить раньше, чем CsrfViewMiddleware
+    прочитает тело запроса, поэтому CSRF проверяется внутри dispatch.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def dispatch(self, request, *args, **kwargs):
+        self.upload_handler = PostImageUploadHandler(request)
+        request.upload_handlers.insert(0, self.upload_handler)
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['upload_errors'] = self.upload_handler.errors
+        return kwargs
+
+
+class PostCreateView(PostImageUploadMixin, LoginRequiredMixin, CreateView):
     model = Post
     template_name = 'blog/create.html'
     form_class = PostForm
@@ -125,7 +354,7 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         )
 
 
-class PostUpdateView(OnlyAuthorMixin, UpdateView):
+class PostUpdateView(PostImageUploadMixin, OnlyAuthorMixin, UpdateView):
     model = Post
     template_name = 'blog/create.html'
     slug_field = 'id'
@@ -134,7 +363,7 @@ class PostUpdateView(OnlyAuthorMixin, UpdateView):
 
     def dispatch(self, request, *args, **kwargs):
         post = self.get_object()
-        if post.author != self.request.user:
+        if post.author_id != self.request.user.id:
             return redirect(
                 'blog:post_detail',
                 self.kwargs[self.slug_url_kwarg])
@@ -1,10 +1,22 @@
+import os
 from pathlib import Path
 
+
+def env_bool(name, default):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-SECRET_KEY = 'django-insecure-$8633r+)*4^5p-#hu&s_2*8g!q%3_61whn6$@7tnolcxv^2qdl'
+SECRET_KEY = os.getenv(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-$8633r+)*4^5p-#hu&s_2*8g!q%3_61whn6$@7tnolcxv^2qdl'
+)
 
-DEBUG = True
+DEBUG = env_bool('DJANGO_DEBUG', True)
 
 ALLOWED_HOSTS = [
     'localhost',
@@ -28,11 +40,15 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blog.middleware.RequestStatsMiddleware',
+    'blog.middleware.ReplicaStickinessMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'blog.middleware.AnonymousPageCacheMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -44,12 +60,29 @@ ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
+# Скомпилированные шаблоны хранятся в памяти процесса и не читаются
+# с диска при каждом запросе; по умолчанию включено вне режима отладки.
+TEMPLATES_CACHED = env_bool('DJANGO_TEMPLATES_CACHED', not DEBUG)
+
+# Компиляция всех шаблонов из TEMPLATES_DIR при запуске WSGI-процесса.
+TEMPLATES_WARM_UP = env_bool('DJANGO_TEMPLATES_WARM_UP', TEMPLATES_CACHED)
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+if TEMPLATES_CACHED:
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -69,6 +102,83 @@ DATABASES = {
     }
 }
 
+# Постоянные соединения: 0 — закрывать после каждого запроса.
+# CONN_HEALTH_CHECKS проверяет соединение перед запросом (blog.connections).
+DATABASE_CONNECTION = {
+    'CONN_MAX_AGE': int(os.getenv('DJANGO_CONN_MAX_AGE', 60)),
+    'CONN_HEALTH_CHECKS': env_bool('DJANGO_CONN_HEALTH_CHECKS', True),
+}
+DATABASES['default'].update(DATABASE_CONNECTION)
+
+# Число открытых соединений в заголовке X-DB-Connections каждого ответа.
+DB_CONNECTION_STATS_HEADER = env_bool('DJANGO_DB_CONNECTION_STATS', DEBUG)
+
+# Время запросов к базе и рендеринга в заголовке Server-Timing.
+SERVER_TIMING_HEADER = env_bool('DJANGO_SERVER_TIMING', DEBUG)
+
+# Запросы дольше порога (мс) пишутся в журнал вместе со всем SQL,
+# параметры SQL — только при уровне DEBUG журнала blog.instrumentation.
+SLOW_REQUEST_THRESHOLD = int(os.getenv('DJANGO_SLOW_REQUEST_MS', 500))
+
+# Поиск N+1: один и тот же SQL, выполненный в запросе N_PLUS_ONE_THRESHOLD
+# раз и больше. 'warn' пишет в журнал, 'raise' (в тестах) — исключение.
+N_PLUS_ONE_DETECTION = os.getenv('DJANGO_N_PLUS_ONE', 'warn')
+N_PLUS_ONE_THRESHOLD = int(os.getenv('DJANGO_N_PLUS_ONE_THRESHOLD', 5))
+
+# Реплики только для чтения: пути к файлам SQLite через запятую.
+# Локально их заполняет команда replicate_db.
+REPLICA_PATHS = [
+    path.strip() for path in os.getenv('DJANGO_DB_REPLICAS', '').split(',')
+    if path.strip()
+]
+DATABASE_REPLICAS = [
+    f'replica{index}' for index in range(1, len(REPLICA_PATHS) + 1)
+]
+DATABASES.update({
+    alias: {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'TEST': {'MIRROR': 'default'},
+        **DATABASE_CONNECTION,
+    } for alias, path in zip(DATABASE_REPLICAS, REPLICA_PATHS)
+})
+
+DATABASE_ROUTERS = ['blog.routers.PrimaryReplicaRouter']
+
+# Сколько секунд после изменения данных посетитель читает
+# из основной базы; должно превышать отставание реплик.
+REPLICA_STICKY_SECONDS = int(os.getenv('DJANGO_REPLICA_STICKY_SECONDS', 10))
+
+# Применяются к каждому новому соединению с SQLite (blog.signals).
+# WAL позволяет читать во время записи комментариев, а busy_timeout
+# заставляет писателей ждать блокировку вместо ошибки database is locked.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'normal'),
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64000)),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+}
+
+# Версии лент в кэше сбрасываются сигналами моделей, и сброс доходит
+# до других процессов (воркеров веб-сервера, run_worker), только если
+# кэш у них общий. LocMemCache по умолчанию хранит кэш в памяти процесса
+# и годится лишь для разработки в одном процессе: иначе процессы отдают
+# устаревшие страницы до POSTS_CACHE_TIMEOUT и разные ETag. В продакшене
+# задайте общий кэш, например
+# DJANGO_CACHE_BACKEND=django.core.cache.backends.db.DatabaseCache
+# и DJANGO_CACHE_LOCATION=blog_cache (таблицу создаёт createcachetable)
+# или PyMemcacheCache с адресом memcached в DJANGO_CACHE_LOCATION.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'DJANGO_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('DJANGO_CACHE_LOCATION', ''),
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -112,6 +222,30 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 MEDIA_URL = 'media/'
 
+# Фото хранятся под именами из хеша содержимого без повторов.
+DEFAULT_FILE_STORAGE = os.getenv(
+    'DJANGO_FILE_STORAGE', 'blog.storage.ContentAddressedStorage'
+)
+
+# Постраничный вывод лент по курсору (pub_date, id) вместо номера страницы.
+BLOG_CURSOR_PAGINATION = False
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blog': {
+            'handlers': ['console'],
+            'level': os.getenv('DJANGO_BLOG_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
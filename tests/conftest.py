@@ -41,6 +41,20 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def raise_on_n_plus_one(settings):
+    settings.N_PLUS_ONE_DETECTION = 'raise'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -108,6 +122,12 @@ def user(mixer):
     return user
 
 
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
 @pytest.fixture
 def another_user(mixer):
     User = get_user_model()
@@ -363,7 +383,17 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
                     os.remove(file_path)
+
+    # Хранилище раскладывает фото по каталогам из хеша содержимого.
+    for root, dirs, files in os.walk(image_dir, topdown=False):
+        if (
+                root != str(image_dir)
+                and not os.listdir(root)
+                and os.path.getmtime(root) >= start_time
+        ):
+            os.rmdir(root)
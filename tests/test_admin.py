@@ -0,0 +1,210 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+@pytest.fixture
+def admin_posts(mixer, user, published_category, published_location):
+    return mixer.cycle(15).blend(
+        "blog.Post", title="Публикация", text="Текст", author=user,
+        category=published_category, location=published_location,
+        pub_date=timezone.now() - timedelta(days=1)
+    )
+
+
+@pytest.mark.django_db
+def test_post_changelist_full_text_search(
+        admin_client: Client, admin_posts, mixer, user, published_category
+):
+    found = mixer.blend(
+        "blog.Post", title="Ёлка", text="Новогодняя", author=user,
+        category=published_category
+    )
+    response = admin_client.get("/admin/blog/post/", {"q": "новогод"})
+    assert list(response.context["cl"].result_list) == [found], (
+        "Убедитесь, что поиск в админке публикаций использует "
+        "полнотекстовый индекс."
+    )
+    with CaptureQueriesContext(connection) as context:
+        admin_client.get("/admin/blog/post/")
+    assert len(context.captured_queries) <= 10, (
+        "Убедитесь, что список публикаций в админке загружает автора, "
+        "место и категорию одним запросом."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_changelist_full_text_search(
+        admin_client: Client, mixer, user, admin_posts
+):
+    mixer.cycle(3).blend(
+        "blog.Comment", post=admin_posts[0], author=user, text="Спасибо"
+    )
+    found = mixer.blend(
+        "blog.Comment", post=admin_posts[1], author=user, text="Отличный ёжик"
+    )
+    response = admin_client.get("/admin/blog/comment/", {"q": "ежик"})
+    assert list(response.context["cl"].result_list) == [found], (
+        "Убедитесь, что в админке комментариев работает полнотекстовый поиск."
+    )
+    assert response.context["cl"].show_full_result_count is False
+
+
+@pytest.mark.django_db
+def test_category_change_page_has_fixed_cost(
+        admin_client: Client, mixer, user, published_category
+):
+    url = f"/admin/blog/category/{published_category.id}/change/"
+
+    def measure():
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get(url)
+        return len(context.captured_queries), len(response.content)
+
+    mixer.cycle(3).blend(
+        "blog.Post", title="Публикация", author=user,
+        category=published_category
+    )
+    measure()
+    queries, size = measure()
+    mixer.cycle(30).blend(
+        "blog.Post", title="Публикация", author=user,
+        category=published_category
+    )
+    queries_after, size_after = measure()
+    assert queries_after == queries, (
+        "Убедитесь, что число запросов страницы категории в админке "
+        "не зависит от числа публикаций."
+    )
+    assert size_after - size < 1000, (
+        "Убедитесь, что страница категории в админке не выводит "
+        "все публикации категории."
+    )
+    assert f"?category__id__exact={published_category.id}" in (
+        admin_client.get(url).content.decode("utf-8")
+    )
+
+
+@pytest.mark.django_db
+def test_post_change_page_uses_autocomplete(admin_client: Client, mixer):
+    post = mixer.blend("blog.Post")
+    mixer.cycle(20).blend("blog.Location")
+    content = admin_client.get(
+        f"/admin/blog/post/{post.id}/change/"
+    ).content.decode("utf-8")
+    assert content.count("admin-autocomplete") >= 3, (
+        "Убедитесь, что автор, место и категория публикации выбираются "
+        "через автодополнение, а не из полного списка."
+    )
+
+
+def run_action(admin_client, action, posts, **data):
+    return admin_client.post("/admin/blog/post/", {
+        "action": action,
+        "_selected_action": [post.id for post in posts],
+        "index": 0,
+        **data,
+    })
+
+
+@pytest.mark.django_db
+def test_bulk_actions_update_posts(
+        admin_client: Client, admin_posts, another_category
+):
+    from blog.models import Post
+
+    run_action(admin_client, "unpublish", admin_posts[:10])
+    assert Post.objects.filter(is_published=False).count() == 10, (
+        "Убедитесь, что действие «Снять с публикации» работает."
+    )
+    run_action(admin_client, "publish", admin_posts)
+    assert not Post.objects.filter(is_published=False).exists()
+
+    run_action(
+        admin_client, "move_to_category", admin_posts[:3],
+        category=another_category.id
+    )
+    assert Post.objects.filter(category=another_category).count() == 3
+
+
+@pytest.mark.django_db
+def test_bulk_update_runs_one_statement_per_batch(admin_posts):
+    from blog.models import Post
+    from blog.moderation import update_posts
+
+    posts = Post.objects.filter(pk__in=[post.pk for post in admin_posts])
+    with CaptureQueriesContext(connection) as context:
+        assert update_posts(posts, batch_size=4, is_published=False) == 15
+    updates = [
+        query for query in context.captured_queries
+        if query["sql"].startswith("UPDATE")
+    ]
+    assert len(updates) == 4, (
+        "Убедитесь, что публикации изменяются одним UPDATE на пачку."
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_update_skips_gaps_between_ids(mixer, user, published_category):
+    from blog.models import Post
+    from blog.moderation import update_posts
+
+    for post_id in (5, 5_000_000):
+        mixer.blend(
+            "blog.Post", id=post_id, author=user,
+            category=published_category
+        )
+    with CaptureQueriesContext(connection) as context:
+        assert update_posts(
+            Post.objects.all(), batch_size=1000, is_published=False
+        ) == 2
+    assert len(context.captured_queries) <= 3, (
+        "Убедитесь, что пачки строятся по выбранным id, а не по всему "
+        "диапазону между ними."
+    )
+
+
+@pytest.mark.django_db
+def test_delete_with_comments_action(
+        admin_client: Client, admin_posts, mixer, user
+):
+    from blog.models import Comment, Post
+
+    mixer.cycle(4).blend(
+        "blog.Comment", post=admin_posts[0], author=user
+    )
+    response = run_action(
+        admin_client, "delete_with_comments", admin_posts[:2]
+    )
+    assert "публикации: 2, комментарии к ним: 4" in (
+        response.content.decode("utf-8")
+    ), "Убедитесь, что удаление публикаций требует подтверждения."
+    assert Post.objects.count() == 15
+
+    run_action(
+        admin_client, "delete_with_comments", admin_posts[:2], post="yes"
+    )
+    assert Post.objects.count() == 13
+    assert not Comment.objects.exists(), (
+        "Убедитесь, что публикации удаляются вместе с комментариями."
+    )
+
+
+@pytest.mark.django_db
+def test_delete_posts_refuses_unknown_relations(monkeypatch, admin_posts):
+    from django.core.exceptions import ImproperlyConfigured
+
+    from blog.models import Post
+    from blog.moderation import delete_posts
+
+    monkeypatch.setattr(
+        Post._meta, "related_objects",
+        (*Post._meta.related_objects, Post._meta.get_field("category"))
+    )
+    with pytest.raises(ImproperlyConfigured):
+        delete_posts(Post.objects.all())
+    assert Post.objects.count() == len(admin_posts)
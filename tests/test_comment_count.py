@@ -0,0 +1,63 @@
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comments(
+        user_client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Новый комментарий"}
+    )
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что при добавлении комментария увеличивается"
+        " поле `comment_count` публикации."
+    )
+    comment = post.comments.get()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что при удалении комментария уменьшается"
+        " поле `comment_count` публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_command(comment_to_a_post):
+    Post.objects.update(comment_count=42)
+    call_command("recount_comments", batch_size=1)
+    post = Post.objects.get(id=comment_to_a_post.post_id)
+    assert post.comment_count == 1, (
+        "Убедитесь, что команда `recount_comments` восстанавливает"
+        " количество комментариев."
+    )
+
+
+@pytest.mark.django_db
+def test_post_delete_skips_comment_counters(
+        mixer, post_with_published_location, django_assert_max_num_queries
+):
+    post = post_with_published_location
+    mixer.cycle(30).blend("blog.Comment", post=post)
+    with django_assert_max_num_queries(10):
+        post.delete()
+    assert not Post.objects.exists()
+
+
+@pytest.mark.django_db
+def test_moved_comment_moves_count(comment_to_a_post, mixer, user):
+    old_post = comment_to_a_post.post
+    new_post = mixer.blend("blog.Post", author=user)
+    comment_to_a_post.post = new_post
+    comment_to_a_post.save()
+    old_post.refresh_from_db()
+    new_post.refresh_from_db()
+    assert (old_post.comment_count, new_post.comment_count) == (0, 1), (
+        "Убедитесь, что при переносе комментария к другой публикации"
+        " счётчики `comment_count` обеих публикаций обновляются."
+    )
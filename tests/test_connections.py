@@ -0,0 +1,50 @@
+import pytest
+from django.test import Client
+
+from blog import connections as blog_connections
+
+
+class FakeConnection:
+    def __init__(self, usable, health_checks=True):
+        self.connection = object()
+        self.settings_dict = {'CONN_HEALTH_CHECKS': health_checks}
+        self.in_atomic_block = False
+        self.usable = usable
+
+    def is_usable(self):
+        return self.usable
+
+    def close(self):
+        self.connection = None
+
+
+class FakeHandler(list):
+    def all(self):
+        return self
+
+
+def test_unusable_connections_are_closed(monkeypatch):
+    broken = FakeConnection(usable=False)
+    alive = FakeConnection(usable=True)
+    unchecked = FakeConnection(usable=False, health_checks=False)
+    monkeypatch.setattr(
+        blog_connections, 'connections',
+        FakeHandler([broken, alive, unchecked])
+    )
+    blog_connections.close_unusable_connections()
+    assert broken.connection is None, (
+        'Убедитесь, что неработающее соединение закрывается до запроса.'
+    )
+    assert alive.connection is not None
+    assert unchecked.connection is not None
+
+
+@pytest.mark.django_db
+def test_connection_stats_header(settings, client: Client):
+    settings.DB_CONNECTION_STATS_HEADER = True
+    client.get('/')
+    response = client.get('/')
+    assert response['X-DB-Connections'].startswith('request=0, worker='), (
+        'Убедитесь, что повторный запрос переиспользует соединение '
+        'и это видно в заголовке X-DB-Connections.'
+    )
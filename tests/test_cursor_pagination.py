@@ -0,0 +1,43 @@
+import pytest
+from django.test import Client, override_settings
+
+from conftest import N_PER_PAGE
+
+
+@pytest.mark.django_db
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pagination(
+        client: Client, many_posts_with_published_locations
+):
+    first_page = client.get("/").context["page_obj"]
+    assert len(first_page) == N_PER_PAGE
+    assert first_page.has_next() and not first_page.has_previous()
+
+    second_page = client.get(
+        "/", {"cursor": first_page.next_cursor}
+    ).context["page_obj"]
+    assert len(second_page) == N_PER_PAGE
+    assert not second_page.has_next() and second_page.has_previous()
+    assert not {post.id for post in first_page} & {
+        post.id for post in second_page
+    }, "Убедитесь, что страницы ленты по курсору не пересекаются."
+
+    previous_page = client.get(
+        "/", {"cursor": second_page.previous_cursor}
+    ).context["page_obj"]
+    assert [post.id for post in previous_page] == [
+        post.id for post in first_page
+    ], "Убедитесь, что курсор предыдущей страницы возвращает ту же страницу."
+
+
+@pytest.mark.django_db
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pagination_skips_count_query(
+        client: Client, many_posts_with_published_locations,
+        django_assert_max_num_queries
+):
+    with django_assert_max_num_queries(3) as captured:
+        client.get("/", {"cursor": "broken"})
+    assert not any(
+        "COUNT(" in query["sql"] for query in captured.captured_queries
+    ), "Убедитесь, что постраничный вывод по курсору не считает записи."
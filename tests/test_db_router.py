@@ -0,0 +1,74 @@
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog.middleware import ReplicaStickinessMiddleware
+from blog.models import Post
+from blog.routers import PrimaryReplicaRouter
+
+router = PrimaryReplicaRouter()
+
+
+def route_reads(request):
+    response = HttpResponse()
+    response.read_dbs = {router.db_for_read(Post) for _ in range(20)}
+    return response
+
+
+def route_read(request):
+    response = HttpResponse()
+    response.read_db = router.db_for_read(Post)
+    return response
+
+
+def test_router_sends_reads_to_replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica1', 'replica2']
+    assert router.db_for_read(Post) in settings.DATABASE_REPLICAS, (
+        'Убедитесь, что чтения направляются в реплики.'
+    )
+    assert router.db_for_write(Post) == 'default'
+    assert router.allow_migrate('replica1', 'blog') is False
+
+    settings.DATABASE_REPLICAS = []
+    assert router.db_for_read(Post) == 'default'
+
+
+def test_writes_stick_to_primary(settings):
+    settings.DATABASE_REPLICAS = ['replica1']
+    middleware = ReplicaStickinessMiddleware(route_read)
+    factory = RequestFactory()
+
+    response = middleware(factory.get('/'))
+    assert response.read_db == 'replica1'
+
+    response = middleware(factory.post('/posts/create/'))
+    assert response.read_db == 'default', (
+        'Убедитесь, что запросы на изменение читают из основной базы.'
+    )
+    cookie = response.cookies['use_primary']
+    assert cookie['max-age'] == settings.REPLICA_STICKY_SECONDS
+
+    factory.cookies['use_primary'] = cookie.value
+    response = middleware(factory.get('/'))
+    assert response.read_db == 'default', (
+        'Убедитесь, что после изменения данных посетитель какое-то время '
+        'читает из основной базы.'
+    )
+    assert 'use_primary' not in response.cookies
+
+
+def test_request_reads_from_one_replica(settings):
+    settings.DATABASE_REPLICAS = ['replica1', 'replica2', 'replica3']
+    middleware = ReplicaStickinessMiddleware(route_reads)
+    assert len(middleware(RequestFactory().get('/')).read_dbs) == 1, (
+        'Убедитесь, что все чтения одного запроса идут в одну реплику.'
+    )
+
+
+def test_database_cache_reads_from_primary(settings):
+    from django.core.cache.backends.db import DatabaseCache
+
+    settings.DATABASE_REPLICAS = ['replica1']
+    cache = DatabaseCache('blog_cache', {})
+    assert router.db_for_read(cache.cache_model_class) == 'default', (
+        'Убедитесь, что таблица кэша читается из основной базы.'
+    )
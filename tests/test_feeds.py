@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category):
+    yesterday = timezone.now() - timedelta(days=1)
+    visible = mixer.blend(
+        "blog.Post", title="Видимая публикация", author=user,
+        category=published_category, is_published=True, pub_date=yesterday
+    )
+    hidden = mixer.blend(
+        "blog.Post", title="Скрытая публикация", author=user,
+        category=published_category, is_published=False, pub_date=yesterday
+    )
+    return visible, hidden
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", ["posts_rss", "posts_atom"])
+def test_posts_feed(feed_posts, client: Client, name):
+    response = client.get(reverse(f"blog:{name}"))
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert "Видимая публикация" in content
+    assert "Скрытая публикация" not in content, (
+        "Убедитесь, что в ленту попадают только опубликованные записи."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "name, content_type",
+    [("rss", "application/rss+xml"), ("atom", "application/atom+xml")],
+)
+def test_category_and_author_feeds(
+        feed_posts, client: Client, user, published_category,
+        name, content_type
+):
+    for url in (
+        reverse(f"blog:category_{name}", args=[published_category.slug]),
+        reverse(f"blog:profile_{name}", args=[user.username]),
+    ):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith(content_type)
+        assert "Видимая публикация" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_unpublished_category_feed_not_found(
+        client: Client, published_category
+):
+    published_category.is_published = False
+    published_category.save()
+    response = client.get(
+        reverse("blog:category_rss", args=[published_category.slug])
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_feed_is_cached(
+        feed_posts, client: Client, django_assert_num_queries
+):
+    url = reverse("blog:posts_atom")
+    etag = client.get(url)["ETag"]
+    with django_assert_num_queries(0):
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        assert client.get(url).status_code == 200
+    visible, _ = feed_posts
+    visible.title = "Новый заголовок"
+    visible.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что кэш ленты сбрасывается при изменении публикаций."
+    )
+    assert "Новый заголовок" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_feed_cache_depends_on_host(feed_posts, client: Client, settings):
+    settings.ALLOWED_HOSTS = ["testserver", "mirror.example"]
+    url = reverse("blog:posts_rss")
+    client.get(url)
+    response = client.get(url, HTTP_HOST="mirror.example", secure=True)
+    assert "https://mirror.example/" in response.content.decode(), (
+        "Убедитесь, что лента из кэша содержит ссылки на хост запроса."
+    )
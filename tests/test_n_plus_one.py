@@ -0,0 +1,48 @@
+import logging
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.instrumentation import NPlusOneError
+from blog.models import FilterQuerySet
+
+
+@pytest.fixture
+def feed_without_select_related(monkeypatch, mixer, user, published_category):
+    mixer.cycle(6).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1)
+    )
+    # reverse() загружает представления до подмены get_posts().
+    url = reverse("blog:category_posts", args=[published_category.slug])
+    get_posts = FilterQuerySet.get_posts
+
+    def get_posts_without_joins(self, apply_filters=True, **kwargs):
+        return get_posts(self, apply_filters, apply_select_related=False)
+
+    monkeypatch.setattr(FilterQuerySet, "get_posts", get_posts_without_joins)
+    return url
+
+
+@pytest.mark.django_db
+def test_n_plus_one_raises_in_tests(
+        client: Client, feed_without_select_related
+):
+    with pytest.raises(NPlusOneError, match="auth_user"):
+        client.get(feed_without_select_related)
+
+
+@pytest.mark.django_db
+def test_n_plus_one_warns_in_production(
+        settings, caplog, client: Client, feed_without_select_related
+):
+    settings.N_PLUS_ONE_DETECTION = "warn"
+    with caplog.at_level(logging.WARNING, logger="blog.instrumentation"):
+        response = client.get(feed_without_select_related)
+    assert response.status_code == 200
+    assert any("N+1" in record.getMessage() for record in caplog.records), (
+        "Убедитесь, что повторяющиеся запросы попадают в журнал."
+    )
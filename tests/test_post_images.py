@@ -0,0 +1,109 @@
+import os
+from io import BytesIO
+
+import pytest
+from django.core.management import call_command
+from django.core.files.images import ImageFile
+from django.test import Client
+from PIL import Image
+
+
+@pytest.fixture
+def post_with_large_image(media_root, mixer, user, published_category):
+    img_io = BytesIO()
+    Image.new("RGB", (800, 400), color=(73, 109, 137)).save(img_io, "JPEG")
+    return mixer.blend(
+        "blog.Post",
+        is_published=True,
+        author=user,
+        category=published_category,
+        image=ImageFile(img_io, name="large_image.jpg"),
+    )
+
+
+@pytest.mark.django_db
+def test_post_image_renditions(
+        client: Client, post_with_large_image
+):
+    post = post_with_large_image
+    call_command("run_worker", "--once")
+    post.refresh_from_db()
+    assert [
+        width for width, _ in post.image_renditions["webp"]
+    ] == [320, 640, 800], (
+        "Убедитесь, что для фото публикации создаются уменьшенные копии."
+    )
+    for width, name in post.image_renditions["jpeg"]:
+        with post.image.storage.open(name) as rendition:
+            assert Image.open(rendition).width == width
+    assert post.image_card_url == post.image.storage.url(
+        post.image_renditions["jpeg"][1][1]
+    ), "Убедитесь, что в карточке выводится копия шириной не меньше 640px."
+
+    content = client.get("/").content.decode("utf-8")
+    assert post.image_webp_srcset in content
+    assert f'src="{post.image_card_url}"' in content, (
+        "Убедитесь, что в ленте выводится уменьшенная копия фото."
+    )
+
+
+@pytest.mark.django_db
+def test_identical_uploads_are_stored_once(
+        media_root, mixer, user, published_category, post_with_large_image
+):
+    post = post_with_large_image
+    copy = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=ImageFile(post.image.open("rb"), name="copy.jpg"),
+    )
+    assert copy.image.name == post.image.name, (
+        "Убедитесь, что одинаковые фото хранятся в одном файле."
+    )
+    call_command("run_worker", "--once")
+    copy.refresh_from_db()
+    post.refresh_from_db()
+    assert copy.image_renditions == post.image_renditions
+
+    post.delete()
+    copy.image = None
+    copy.save()
+    call_command("collect_media", min_age=0)
+    assert not copy.image.storage.exists(post.image.name), (
+        "Убедитесь, что collect_media удаляет фото без публикаций."
+    )
+
+
+@pytest.mark.django_db
+def test_replaced_image_skips_stale_renditions(
+        media_root, post_with_large_image
+):
+    post = post_with_large_image
+    call_command("run_worker", "--once")
+    post.refresh_from_db()
+    img_io = BytesIO()
+    Image.new("RGB", (700, 300), color=(0, 0, 0)).save(img_io, "JPEG")
+    post.image = ImageFile(img_io, name="new_image.jpg")
+    post.save()
+    assert post.image_renditions["jpeg"], "Копии ещё не пересчитаны."
+    assert post.image_card_url == post.image.url, (
+        "Убедитесь, что до создания новых копий выводится новое фото."
+    )
+    assert not post.image_webp_srcset
+    assert not post.image_jpeg_srcset
+
+
+@pytest.mark.django_db
+def test_reused_upload_is_touched(
+        mixer, user, published_category, post_with_large_image
+):
+    post = post_with_large_image
+    path = post.image.path
+    os.utime(path, (0, 0))
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=ImageFile(post.image.open("rb"), name="copy.jpg"),
+    )
+    assert os.path.getmtime(path) > 0, (
+        "Убедитесь, что повторная загрузка файла обновляет время его "
+        "изменения: иначе collect_media может удалить его как старый."
+    )
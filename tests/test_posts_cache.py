@@ -0,0 +1,215 @@
+import importlib
+import time
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.test import Client
+from django.utils import timezone
+
+from blog.cache import get_posts_timeout
+from blog.constants import POSTS_CACHE_TIMEOUT
+from blogicum import settings as project_settings
+
+
+@pytest.mark.django_db
+def test_cached_feed_invalidated_on_post_change(
+        client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+    post.title = "Изменённый заголовок"
+    post.save()
+    assert "Изменённый заголовок" in client.get("/").content.decode(
+        "utf-8"
+    ), "Убедитесь, что кэш ленты сбрасывается при изменении публикации."
+
+
+@pytest.mark.django_db
+def test_cached_feed_expires_with_scheduled_post(
+        mixer, user, published_category
+):
+    assert get_posts_timeout() == POSTS_CACHE_TIMEOUT
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(seconds=30)
+    )
+    assert get_posts_timeout() <= 30, (
+        "Убедитесь, что кэш ленты истекает к моменту отложенной публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_fragment_cached_per_version(
+        client: Client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+    post.refresh_from_db()
+    key = make_template_fragment_key("post_card", [post.id, post.card_version])
+    assert cache.get(key), (
+        "Убедитесь, что карточка публикации кэшируется как фрагмент шаблона."
+    )
+    mixer.blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    assert make_template_fragment_key(
+        "post_card", [post.id, post.card_version]
+    ) != key, (
+        "Убедитесь, что ключ карточки меняется вместе с числом комментариев."
+    )
+    assert "Комментарии (1)" in client.get("/").content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_anonymous_page_cache(
+        client: Client, user_client: Client, post_with_published_location,
+        django_assert_num_queries
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    response = client.get(url)
+    assert "Cookie" in response["Vary"]
+    with django_assert_num_queries(0):
+        client.get(url)
+    assert "Удалить публикацию" in user_client.get(url).content.decode(
+        "utf-8"
+    ), "Убедитесь, что авторизованным пользователям страница не из кэша."
+    post.text = "Новый текст публикации"
+    post.save()
+    assert "Новый текст публикации" in client.get(url).content.decode(
+        "utf-8"
+    ), "Убедитесь, что кэш страниц сбрасывается при изменении публикации."
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/", "/posts/{post_id}/"])
+def test_conditional_get(
+        user_client: Client, post_with_published_location, url
+):
+    url = url.format(post_id=post_with_published_location.id)
+    response = user_client.get(url)
+    etag = response["ETag"]
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что на запрос с актуальным ETag возвращается статус 304."
+    )
+    post_with_published_location.comments.create(
+        author=post_with_published_location.author, text="Комментарий"
+    )
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что новый комментарий меняет ETag страницы."
+    )
+
+
+@pytest.mark.django_db
+def test_scheduled_post_appears_on_index(
+        monkeypatch, user_client: Client, mixer, user, published_category
+):
+    now = timezone.now()
+    mixer.blend(
+        "blog.Post", title="Отложенная публикация", author=user,
+        category=published_category, is_published=True,
+        pub_date=now + timedelta(minutes=1)
+    )
+    response = user_client.get("/")
+    assert "Отложенная публикация" not in response.content.decode("utf-8")
+    # Через две минуты: истекли и отложенная дата, и записи кэша.
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+    monkeypatch.setattr(
+        timezone, "now", lambda: now + timedelta(minutes=2)
+    )
+    response = user_client.get("/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 200
+    assert "Отложенная публикация" in response.content.decode("utf-8"), (
+        "Убедитесь, что отложенная публикация появляется на главной "
+        "странице, когда наступает её время."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_invalidates_only_its_feeds(
+        client: Client, mixer, user, another_user, published_category,
+        another_category, django_assert_num_queries
+):
+    yesterday = timezone.now() - timedelta(days=1)
+    post, other_post = (
+        mixer.blend(
+            "blog.Post", author=author, category=category,
+            is_published=True, pub_date=yesterday
+        ) for author, category in (
+            (user, published_category), (another_user, another_category)
+        )
+    )
+    other_urls = (
+        f"/posts/{other_post.id}/",
+        f"/category/{another_category.slug}/",
+        f"/profile/{another_user.username}/",
+    )
+    for url in ("/", *other_urls):
+        client.get(url)
+    mixer.blend("blog.Comment", post=post)
+    with django_assert_num_queries(0):
+        for url in other_urls:
+            assert client.get(url).status_code == 200
+    assert "Комментарии (1)" in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что комментарий сбрасывает кэш лент его публикации."
+    )
+
+
+def test_cache_backend_from_environment(monkeypatch):
+    backend = "django.core.cache.backends.db.DatabaseCache"
+    monkeypatch.setenv("DJANGO_CACHE_BACKEND", backend)
+    monkeypatch.setenv("DJANGO_CACHE_LOCATION", "blog_cache")
+    try:
+        cache_settings = importlib.reload(project_settings).CACHES["default"]
+    finally:
+        monkeypatch.undo()
+        importlib.reload(project_settings)
+    assert cache_settings == {"BACKEND": backend, "LOCATION": "blog_cache"}, (
+        "Убедитесь, что общий для процессов кэш задаётся из окружения."
+    )
+
+
+@pytest.mark.django_db
+def test_user_change_invalidates_pages(
+        client: Client, user, post_with_published_location
+):
+    old_username = user.username
+    profile_url = f"/profile/{old_username}/"
+    for url in (profile_url, "/"):
+        client.get(url)
+    user.username = "renamed"
+    user.save()
+    assert client.get(profile_url).status_code == 404, (
+        "Убедитесь, что смена имени пользователя сбрасывает кэш профиля."
+    )
+    content = client.get("/").content.decode("utf-8")
+    assert "@renamed" in content and f"@{old_username}" not in content, (
+        "Убедитесь, что смена имени пользователя сбрасывает кэш лент."
+    )
+    client.get("/profile/renamed/")
+    user.first_name = "Новое имя"
+    user.save()
+    assert "Новое имя" in client.get("/profile/renamed/").content.decode(
+        "utf-8"
+    ), "Убедитесь, что изменение профиля сбрасывает кэш его страницы."
+
+
+@pytest.mark.django_db
+def test_post_etag_changes_with_csrf_token(
+        client: Client, user, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    client.force_login(user)
+    etag = client.get(url)["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    client.logout()
+    client.force_login(user)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что после нового входа страница публикации с формой "
+        "комментария не отдаётся со старым CSRF-токеном."
+    )
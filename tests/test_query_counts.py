@@ -0,0 +1,96 @@
+import pytest
+from django.test import Client
+
+from blog.constants import COMMENTS_PER_PAGE_LIMIT
+
+
+@pytest.mark.django_db
+def test_post_detail_query_count(
+        client: Client, user_client: Client, post_with_published_location,
+        django_assert_num_queries
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    # Публикация вместе с автором, категорией и местом; комментарии;
+    # ближайшая отложенная публикация для срока жизни кэша страницы.
+    with django_assert_num_queries(3):
+        client.get(url)
+    # Повторный анонимный запрос отдаётся из кэша страниц.
+    with django_assert_num_queries(0):
+        client.get(url)
+    # Плюс сессия и пользователь для авторизованного автора.
+    with django_assert_num_queries(4):
+        user_client.get(url)
+
+
+@pytest.mark.django_db
+def test_post_detail_comments_query_count(
+        client: Client, mixer, post_with_published_location,
+        django_assert_num_queries
+):
+    post = post_with_published_location
+    mixer.cycle(COMMENTS_PER_PAGE_LIMIT + 5).blend("blog.Comment", post=post)
+    with django_assert_num_queries(3):
+        response = client.get(f"/posts/{post.id}/")
+    comments = response.context["comments"]
+    assert len(comments) == COMMENTS_PER_PAGE_LIMIT
+    assert comments.has_next(), (
+        "Убедитесь, что на странице публикации выводится первая страница"
+        " комментариев со ссылкой на следующую."
+    )
+    with django_assert_num_queries(2):
+        response = client.get(
+            f"/posts/{post.id}/comments/",
+            {"cursor": comments.next_cursor}
+        )
+    assert len(response.context["comments"]) == 5
+    assert "<html" not in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_hidden_post_detail_single_query(
+        client: Client, unpublished_posts_with_published_locations,
+        django_assert_num_queries
+):
+    post = unpublished_posts_with_published_locations[0]
+    with django_assert_num_queries(1):
+        response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("url", "expected_queries", "cached_queries"),
+    [
+        # Количество публикаций, страница ленты и ближайшая отложенная
+        # публикация для срока жизни кэша; из кэша ленты — без запросов.
+        ("/", 3, 0),
+        # То же и категория, которая из кэша не берётся.
+        ("/category/{category_slug}/", 4, 1),
+        # То же и автор.
+        ("/profile/{username}/", 4, 1),
+    ],
+    ids=["index", "category", "profile"],
+)
+def test_post_list_query_count(
+        client: Client, many_posts_with_published_locations,
+        published_category, user, url, expected_queries, cached_queries,
+        django_assert_num_queries
+):
+    url = url.format(
+        category_slug=published_category.slug, username=user.username
+    )
+    with django_assert_num_queries(expected_queries):
+        client.get(url)
+    # Другой адрес минует кэш страниц, но не кэш ленты.
+    with django_assert_num_queries(cached_queries):
+        client.get(url, {"utm_source": "test"})
+
+
+@pytest.mark.django_db
+def test_edit_post_resolves_post_once(
+        user_client: Client, post_with_published_location,
+        django_assert_num_queries
+):
+    # Публикация, сессия, пользователь и списки категорий и мест для формы.
+    with django_assert_num_queries(5):
+        user_client.get(f"/posts/{post_with_published_location.id}/edit/")
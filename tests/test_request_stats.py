@@ -0,0 +1,64 @@
+import json
+import logging
+
+import pytest
+from django.test import Client
+
+
+@pytest.mark.django_db
+def test_server_timing_and_log(
+        caplog, client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    with caplog.at_level(logging.INFO, logger='blog.instrumentation'):
+        response = client.get(f'/posts/{post.id}/')
+    timing = response['Server-Timing']
+    assert timing.startswith('db;dur='), (
+        'Убедитесь, что время запросов к базе передаётся в Server-Timing.'
+    )
+    assert 'tpl;dur=' in timing and 'total;dur=' in timing
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record['view'] == 'blog:post_detail'
+    assert record['queries'] > 0
+    assert f'desc="{record["queries"]} queries"' in timing
+
+
+@pytest.mark.django_db
+def test_slow_request_logs_sql(
+        settings, caplog, client: Client, post_with_published_location
+):
+    settings.SLOW_REQUEST_THRESHOLD = 0
+    with caplog.at_level(logging.INFO, logger='blog.instrumentation'):
+        client.get(f'/posts/{post_with_published_location.id}/')
+    warnings = [
+        record for record in caplog.records
+        if record.levelno == logging.WARNING
+    ]
+    assert warnings and 'FROM "blog_post"' in warnings[0].getMessage(), (
+        'Убедитесь, что для медленных запросов в журнал пишется их SQL.'
+    )
+
+
+@pytest.mark.django_db
+def test_slow_request_log_hides_sql_params(
+        settings, caplog, user_client: Client
+):
+    settings.SLOW_REQUEST_THRESHOLD = 0
+    session_key = user_client.session.session_key
+    with caplog.at_level(logging.INFO, logger='blog.instrumentation'):
+        user_client.get('/')
+    messages = [
+        record.getMessage() for record in caplog.records
+        if record.levelno == logging.WARNING
+    ]
+    assert messages and 'django_session' in messages[0]
+    assert session_key not in messages[0], (
+        'Убедитесь, что параметры SQL не попадают в журнал '
+        'медленных запросов.'
+    )
+    caplog.clear()
+    with caplog.at_level(logging.DEBUG, logger='blog.instrumentation'):
+        user_client.get('/')
+    assert any(
+        session_key in record.getMessage() for record in caplog.records
+    )
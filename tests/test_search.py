@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.utils import timezone
+
+from blog.models import Post
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make_post(title, text, is_published=True):
+        return mixer.blend(
+            "blog.Post", title=title, text=text, author=user,
+            category=published_category, is_published=is_published,
+            pub_date=timezone.now() - timedelta(days=1)
+        )
+    return make_post
+
+
+def search(client, query, page=None):
+    data = {"q": query}
+    if page:
+        data["page"] = page
+    return client.get("/search/", data=data)
+
+
+@pytest.mark.django_db
+def test_search_ranks_and_respects_visibility(client: Client, make_post):
+    in_text = make_post("Прогулка", "Встретили в лесу ёжиков")
+    in_title = make_post("Ёжики в тумане", "Мультфильм")
+    make_post("Черновик про ежей", "ёжики", is_published=False)
+    make_post("Другое", "Про котов")
+
+    response = search(client, "ежик")
+    assert list(response.context["page_obj"]) == [in_title, in_text], (
+        "Убедитесь, что поиск находит слова по началу без учёта «ё», "
+        "скрывает неопубликованные записи и выше ставит совпадения "
+        "в заголовке."
+    )
+
+
+@pytest.mark.django_db
+def test_search_index_follows_changes(client: Client, make_post):
+    post = make_post("Старый заголовок", "Текст")
+    Post.objects.filter(pk=post.pk).update(title="Новый заголовок")
+    assert not search(client, "старый").context["page_obj"]
+    assert list(search(client, "новый").context["page_obj"]) == [post]
+
+    post.delete()
+    assert not search(client, "новый").context["page_obj"], (
+        "Убедитесь, что удалённые публикации пропадают из поиска."
+    )
+
+    make_post("Восстановленный", "Текст")
+    call_command("rebuild_search_index")
+    assert search(client, "восстановленный").context["page_obj"]
+
+
+@pytest.mark.django_db
+def test_search_pagination_keeps_query(client: Client, make_post):
+    for index in range(12):
+        make_post(f"Заметка {index}", "Поиск по страницам")
+    response = search(client, "страниц")
+    assert response.context["paginator"].count == 12
+    assert "?q=%D1%81%D1%82%D1%80%D0%B0%D0%BD%D0%B8%D1%86&amp;page=2" in (
+        response.content.decode("utf-8")
+    ), "Убедитесь, что ссылки на страницы результатов сохраняют запрос."
+    assert len(search(client, "страниц", page=2).context["page_obj"]) == 2
+    assert not search(client, "  ").context["page_obj"]
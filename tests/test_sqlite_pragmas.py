@@ -0,0 +1,20 @@
+import pytest
+from django.db import connections
+
+
+@pytest.mark.django_db
+def test_sqlite_connection_pragmas(settings):
+    settings.SQLITE_PRAGMAS = {'synchronous': 'normal', 'busy_timeout': 1234}
+    connection = connections.create_connection('default')
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone()[0] == 1, (
+                'Убедитесь, что synchronous=NORMAL задаётся при подключении.'
+            )
+            cursor.execute('PRAGMA busy_timeout')
+            assert cursor.fetchone()[0] == 1234, (
+                'Убедитесь, что busy_timeout задаётся при подключении.'
+            )
+    finally:
+        connection.close()
@@ -0,0 +1,62 @@
+import pytest
+from django.utils import timezone
+
+from blog.models import Task
+from blog.tasks import enqueue, run_pending, task
+
+CALLS = []
+
+
+@task
+def record_call(value):
+    CALLS.append(value)
+
+
+@task
+def always_fail():
+    raise RuntimeError("Ошибка задачи")
+
+
+@pytest.mark.django_db
+def test_task_runs_and_is_removed():
+    CALLS.clear()
+    enqueue(record_call, value=42)
+    assert run_pending() == (1, 0)
+    assert CALLS == [42]
+    assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+def test_failed_task_is_retried_with_backoff():
+    job = enqueue(always_fail)
+    assert run_pending() == (0, 1)
+    job.refresh_from_db()
+    assert job.status == Task.PENDING
+    assert job.attempts == 1
+    assert job.run_at > timezone.now(), (
+        "Убедитесь, что повтор задачи откладывается."
+    )
+    assert "Ошибка задачи" in job.last_error
+    assert run_pending() == (0, 0)
+
+
+@pytest.mark.django_db
+def test_post_is_not_saved_without_its_task(
+        monkeypatch, mixer, user, published_category
+):
+    from blog.models import Post
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("Очередь недоступна")
+
+    monkeypatch.setattr(Task.objects, "create", fail)
+    with pytest.raises(RuntimeError):
+        Post.objects.create(
+            title="Заголовок", text="Текст", pub_date=timezone.now(),
+            author=user, category=published_category,
+            image="posts_images/photo.jpg"
+        )
+    assert not Post.objects.exists(), (
+        "Убедитесь, что публикация и задача на копии фото сохраняются "
+        "в одной транзакции."
+    )
@@ -0,0 +1,31 @@
+import importlib
+
+import pytest
+from django.core.management import call_command
+from django.template import engines
+
+from blogicum import settings as project_settings
+
+
+@pytest.fixture
+def cached_templates(monkeypatch, settings):
+    monkeypatch.setenv("DJANGO_TEMPLATES_CACHED", "1")
+    try:
+        settings.TEMPLATES = importlib.reload(project_settings).TEMPLATES
+    finally:
+        monkeypatch.undo()
+        importlib.reload(project_settings)
+    return engines["django"].engine.template_loaders[0]
+
+
+def test_warm_templates_fills_cached_loader(cached_templates, capsys):
+    assert cached_templates.get_template_cache == {}, (
+        "Убедитесь, что при DJANGO_TEMPLATES_CACHED шаблоны загружаются "
+        "через cached loader."
+    )
+    call_command("warm_templates")
+    assert "blog/detail.html" in capsys.readouterr().out
+    assert "blog/detail.html" in cached_templates.get_template_cache, (
+        "Убедитесь, что команда `warm_templates` компилирует шаблоны "
+        "в кэш загрузчика."
+    )
@@ -0,0 +1,98 @@
+from io import BytesIO
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from PIL import Image
+
+from blog import uploadhandlers
+from blog.models import Post, UploadQuota
+
+
+def make_image(size=(20, 10), image_format="PNG"):
+    img_io = BytesIO()
+    Image.new("RGB", size, color=(73, 109, 137)).save(img_io, image_format)
+    return img_io.getvalue()
+
+
+def create_post(client, published_category, content, name="photo.png"):
+    return client.post("/posts/create/", data={
+        "title": "Заголовок",
+        "text": "Текст",
+        "pub_date": "2020-01-01T00:00",
+        "category": published_category.id,
+        "image": SimpleUploadedFile(name, content),
+    })
+
+
+@pytest.mark.django_db
+def test_upload_rejects_non_image_early(
+        media_root, monkeypatch, user_client: Client, published_category
+):
+    monkeypatch.setattr(uploadhandlers, "POST_IMAGE_HEADER_LIMIT", 1024)
+    response = create_post(
+        user_client, published_category, b"not an image" * 1000
+    )
+    assert response.status_code == 200
+    assert "image" in response.context["form"].errors, (
+        "Убедитесь, что загрузка не-изображения отклоняется."
+    )
+    assert not Post.objects.exists()
+
+
+@pytest.mark.django_db
+def test_upload_rejects_large_resolution(
+        media_root, monkeypatch, user_client: Client, published_category
+):
+    monkeypatch.setattr(uploadhandlers, "POST_IMAGE_MAX_SIDE", 15)
+    response = create_post(user_client, published_category, make_image())
+    assert "15px" in response.context["form"].errors["image"][0], (
+        "Убедитесь, что фото слишком большого разрешения отклоняется."
+    )
+    assert not Post.objects.exists()
+
+
+@pytest.mark.django_db
+def test_upload_quota_is_per_user(
+        media_root, monkeypatch, user_client: Client,
+        another_user_client: Client, published_category
+):
+    content = make_image()
+    monkeypatch.setattr(
+        uploadhandlers, "POST_IMAGE_DAILY_QUOTA", len(content) * 3 // 2
+    )
+    response = create_post(user_client, published_category, content)
+    assert response.status_code == 302
+    response = create_post(user_client, published_category, content)
+    assert "квота" in response.context["form"].errors["image"][0], (
+        "Убедитесь, что суточная квота загрузки фото соблюдается."
+    )
+    response = create_post(another_user_client, published_category, content)
+    assert response.status_code == 302, (
+        "Убедитесь, что квота загрузки фото считается для каждого "
+        "пользователя отдельно."
+    )
+    assert Post.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_upload_quota_is_stored_in_database(
+        media_root, monkeypatch, user_client: Client, client: Client,
+        published_category
+):
+    content = make_image()
+    monkeypatch.setattr(
+        uploadhandlers, "POST_IMAGE_DAILY_QUOTA", len(content) * 3 // 2
+    )
+    create_post(client, published_category, content)
+    assert not UploadQuota.objects.exists(), (
+        "Убедитесь, что загрузки анонимных пользователей не учитываются "
+        "в квоте."
+    )
+    create_post(user_client, published_category, content)
+    cache.clear()
+    response = create_post(user_client, published_category, content)
+    assert "квота" in response.context["form"].errors["image"][0], (
+        "Убедитесь, что квота загрузки фото хранится не в кэше процесса."
+    )